@@ -0,0 +1,61 @@
+"""Measure GitHub fetch throughput against a local stand-in server.
+
+    python benchmarks/fetch_throughput.py --issues 300 --latency 0.02 --concurrency 1 4 16
+    python benchmarks/fetch_throughput.py --record /tmp/session.jsonl
+    python benchmarks/fetch_throughput.py --replay /tmp/session.jsonl
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+from sprintforecast.fake_github import FakeGitHub, FakeRepo
+from sprintforecast.github_client import GitHubClient
+from sprintforecast.transport import RecordingAdapter, ReplayAdapter
+from sprintforecast.triad_fetcher import TriadFetcher
+from sprintforecast.workflow import WorkflowSpec, fetch_event_table
+
+
+def run(gh: GitHubClient, owner: str, repo: str, issues: int, concurrency: int) -> tuple[float, float]:
+    start = time.perf_counter()
+    triads = TriadFetcher(gh, owner, repo, 1).fetch()
+    mid = time.perf_counter()
+    nums = range(1, issues + 1)
+    table = fetch_event_table(gh, owner, repo, nums, WorkflowSpec.default(), concurrency)
+    end = time.perf_counter()
+    if not triads or not len(table):
+        raise RuntimeError("fetch returned no data")
+    return mid - start, end - mid
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--issues", type=int, default=300)
+    ap.add_argument("--cycles", type=int, default=2)
+    ap.add_argument("--latency", type=float, default=0.02, help="seconds added per request")
+    ap.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8, 16])
+    ap.add_argument("--record", help="append every exchange to this cassette")
+    ap.add_argument("--replay", help="serve every request from this cassette instead")
+    args = ap.parse_args()
+
+    print(f"{'concurrency':>11}{'triads s':>10}{'timelines s':>13}{'issues/s':>10}")
+    if args.replay:
+        # isolates client-side cost: parsing, pooling and table building without I/O
+        replay = ReplayAdapter(args.replay, strict=False)
+        for c in args.concurrency:
+            gh = GitHubClient("replay", pool=c, transport=replay)
+            triads, timelines = run(gh, "acme", "widgets", args.issues, c)
+            print(f"{c:>11}{triads:>10.3f}{timelines:>13.3f}{args.issues / timelines:>10.1f}")
+        return
+    repo = FakeRepo.synthetic(issues=args.issues, cycles=args.cycles)
+    with FakeGitHub(repo, latency=args.latency) as fake:
+        for c in args.concurrency:
+            transport = RecordingAdapter(args.record, pool_maxsize=c) if args.record else None
+            gh = GitHubClient("bench", base_url=fake.base_url, pool=c, transport=transport)
+            triads, timelines = run(gh, fake.owner, fake.name, args.issues, c)
+            print(f"{c:>11}{triads:>10.3f}{timelines:>13.3f}{args.issues / timelines:>10.1f}")
+        print(f"{fake.requests} requests served")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Compare completion-probability error of each sampling scheme against draws.
+
+    python benchmarks/sampling_convergence.py --tickets 20 --reps 30
+"""
+from __future__ import annotations
+
+import argparse
+import time
+import warnings
+from dataclasses import replace
+
+import numpy as np
+
+from sprintforecast.accumulator import ForecastAccumulator
+from sprintforecast.distributions import BetaDistribution, SkewTDistribution
+from sprintforecast.forecast import SprintForecastEngine
+from sprintforecast.queue_simulator import QueueSimulator
+from sprintforecast.sampling import SamplingScheme
+from sprintforecast.strategies import CapacityStrategy, ExecutionStrategy, ReviewStrategy
+from sprintforecast.ticket import Ticket
+
+
+def build_engine(tickets: int, workers: int) -> SprintForecastEngine:
+    engine = SprintForecastEngine(
+        tickets=[Ticket(1, 2 + i % 3, 6 + i % 4) for i in range(tickets)],
+        exec_strategy=ExecutionStrategy(SkewTDistribution(0, 0.25, 2, 5)),
+        review_strategy=ReviewStrategy(BetaDistribution(2, 5, 0.1, 1.5)),
+        capacity_strategy=CapacityStrategy(BetaDistribution(8, 2, 40, 55)),
+        simulator=QueueSimulator(workers),
+        remaining_hours=0.0,
+        rng=np.random.default_rng(0),
+    )
+    # put the deadline at the P70 makespan, where the estimator variance is large
+    pilot = engine.run(20_000, engine.rng, ForecastAccumulator())
+    return replace(engine, remaining_hours=pilot.makespan.quantile(0.7))
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--tickets", type=int, default=20)
+    ap.add_argument("--workers", type=int, default=3)
+    ap.add_argument("--reps", type=int, default=30)
+    ap.add_argument("--reference", type=int, default=1_000_000)
+    ap.add_argument("--draws", type=int, nargs="+", default=[256, 1024, 4096])
+    args = ap.parse_args()
+
+    warnings.simplefilter("ignore")
+    engine = build_engine(args.tickets, args.workers)
+    ref = replace(engine, rng=np.random.default_rng(2**31)).forecast(args.reference).probability
+    print(f"reference P(finish) = {ref:.4f} ({args.reference} MC draws)")
+    print(f"{'scheme':<11}{'draws':>7}{'rmse':>10}{'mc/scheme var':>15}{'sec/run':>10}")
+    baseline: dict[int, float] = {}
+    for scheme in SamplingScheme:
+        for draws in args.draws:
+            est = np.empty(args.reps)
+            start = time.perf_counter()
+            for k in range(args.reps):
+                eng = replace(engine, rng=np.random.default_rng(k), sampling=scheme)
+                est[k] = eng.forecast(draws).probability
+            secs = (time.perf_counter() - start) / args.reps
+            rmse = float(np.sqrt(np.mean((est - ref) ** 2)))
+            baseline.setdefault(draws, rmse)
+            gain = (baseline[draws] / rmse) ** 2 if rmse else float("inf")
+            print(f"{scheme.value:<11}{draws:>7}{rmse:>10.5f}{gain:>15.2f}{secs:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
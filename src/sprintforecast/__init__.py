@@ -1,48 +1,189 @@
-from .forecast import ForecastEngine, ForecastResult, SprintForecastEngine
-from .queue_simulator import QueueSimulator
-from .strategies import CapacityStrategy, ExecutionStrategy, ReviewStrategy
-from .ticket import Ticket
-from .distributions import BetaDistribution, GammaDistribution, LogNormalDistribution, SkewTDistribution, EmpiricalDistribution, DistributionFactory
-from .rng_singleton import RNGSingleton
-from .project_board import ProjectBoard
-from .timeline_fetcher import TimelineFetcher
-from .issue_fetcher import IssueFetcher
-from .github_client import GitHubClient
-from .sprint_intake import SprintIntake
-from .types import Sample
-from .symbolic_metrics import (
-    SymbolicMetrics,
-)
-from .triad_fetcher import TriadFetcher
-from .real_engine import RealSprintForecastEngine
-
-from .size import Size
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+# public name -> submodule; resolved on first access so `import sprintforecast` stays cheap
+_LAZY = {
+    "ForecastEngine": "forecast",
+    "ForecastResult": "forecast",
+    "ForecastTally": "forecast",
+    "SprintForecastEngine": "forecast",
+    "ParallelForecaster": "parallel",
+    "AdaptiveForecaster": "adaptive",
+    "ForecastAccumulator": "accumulator",
+    "QuantileSketch": "accumulator",
+    "QueueSimulator": "queue_simulator",
+    "DependencySimulator": "dependency_simulator",
+    "PipelineResult": "pipeline_simulator",
+    "PipelineSimulator": "pipeline_simulator",
+    "CapacityStrategy": "strategies",
+    "ExecutionStrategy": "strategies",
+    "ReviewStrategy": "strategies",
+    "Ticket": "ticket",
+    "TicketBatch": "ticket_batch",
+    "BetaDistribution": "distributions",
+    "GammaDistribution": "distributions",
+    "LogNormalDistribution": "distributions",
+    "SkewTDistribution": "distributions",
+    "EmpiricalDistribution": "distributions",
+    "DistributionFactory": "distributions",
+    "RNGSingleton": "rng_singleton",
+    "SamplingScheme": "sampling",
+    "UniformSampler": "sampling",
+    "PairedDelta": "scenarios",
+    "Scenario": "scenarios",
+    "ScenarioEngine": "scenarios",
+    "ScenarioResult": "scenarios",
+    "BatchEntry": "batch",
+    "BatchForecaster": "batch",
+    "BatchResult": "batch",
+    "ForecastServer": "service",
+    "ForecastService": "service",
+    "WarmProject": "service",
+    "BenchSweep": "bench",
+    "BenchResult": "bench",
+    "Regression": "bench",
+    "Profile": "profiling",
+    "ProjectBoard": "project_board",
+    "TimelineFetcher": "timeline_fetcher",
+    "EventTable": "event_table",
+    "WorkflowSpec": "workflow",
+    "IssueFetcher": "issue_fetcher",
+    "GitHubClient": "github_client",
+    "HTTPCache": "http_cache",
+    "RateBudget": "rate_limit",
+    "RateStats": "rate_limit",
+    "RecordingAdapter": "transport",
+    "ReplayAdapter": "transport",
+    "FakeGitHub": "fake_github",
+    "FakeRepo": "fake_github",
+    "LocalStore": "local_store",
+    "SyncReport": "local_store",
+    "SprintIntake": "sprint_intake",
+    "IntakeOptimizer": "intake_optimizer",
+    "IntakePlan": "intake_optimizer",
+    "Sample": "types",
+    "SymbolicMetrics": "symbolic_metrics",
+    "TriadFetcher": "triad_fetcher",
+    "RealSprintForecastEngine": "real_engine",
+    "Size": "size",
+}
+
+if TYPE_CHECKING:
+    from .forecast import ForecastEngine, ForecastResult, ForecastTally, SprintForecastEngine
+    from .parallel import ParallelForecaster
+    from .adaptive import AdaptiveForecaster
+    from .accumulator import ForecastAccumulator, QuantileSketch
+    from .queue_simulator import QueueSimulator
+    from .dependency_simulator import DependencySimulator
+    from .pipeline_simulator import PipelineResult, PipelineSimulator
+    from .strategies import CapacityStrategy, ExecutionStrategy, ReviewStrategy
+    from .ticket import Ticket
+    from .ticket_batch import TicketBatch
+    from .distributions import BetaDistribution, GammaDistribution, LogNormalDistribution, SkewTDistribution, EmpiricalDistribution, DistributionFactory
+    from .rng_singleton import RNGSingleton
+    from .sampling import SamplingScheme, UniformSampler
+    from .scenarios import PairedDelta, Scenario, ScenarioEngine, ScenarioResult
+    from .batch import BatchEntry, BatchForecaster, BatchResult
+    from .service import ForecastServer, ForecastService, WarmProject
+    from .bench import BenchResult, BenchSweep, Regression
+    from .profiling import Profile
+    from .project_board import ProjectBoard
+    from .timeline_fetcher import TimelineFetcher
+    from .event_table import EventTable
+    from .workflow import WorkflowSpec
+    from .issue_fetcher import IssueFetcher
+    from .github_client import GitHubClient
+    from .http_cache import HTTPCache
+    from .rate_limit import RateBudget, RateStats
+    from .transport import RecordingAdapter, ReplayAdapter
+    from .fake_github import FakeGitHub, FakeRepo
+    from .local_store import LocalStore, SyncReport
+    from .sprint_intake import SprintIntake
+    from .intake_optimizer import IntakeOptimizer, IntakePlan
+    from .types import Sample
+    from .symbolic_metrics import SymbolicMetrics
+    from .triad_fetcher import TriadFetcher
+    from .real_engine import RealSprintForecastEngine
+    from .size import Size
+
 
 __all__ = [
     "GitHubClient",
+    "HTTPCache",
+    "RateBudget",
+    "RateStats",
+    "RecordingAdapter",
+    "ReplayAdapter",
+    "FakeGitHub",
+    "FakeRepo",
+    "LocalStore",
+    "SyncReport",
     "IssueFetcher",
     "TimelineFetcher",
+    "EventTable",
+    "WorkflowSpec",
     "ProjectBoard",
     "RNGSingleton",
+    "SamplingScheme",
+    "UniformSampler",
     "BetaDistribution",
     "SkewTDistribution",
     "GammaDistribution",
     "LogNormalDistribution",
     "DistributionFactory",
     "Ticket",
+    "TicketBatch",
     "ExecutionStrategy",
     "ReviewStrategy",
     "CapacityStrategy",
     "QueueSimulator",
+    "DependencySimulator",
+    "PipelineSimulator",
+    "PipelineResult",
     "ForecastResult",
+    "ForecastTally",
+    "ParallelForecaster",
+    "AdaptiveForecaster",
+    "ForecastAccumulator",
+    "QuantileSketch",
+    "Scenario",
+    "ScenarioEngine",
+    "ScenarioResult",
+    "PairedDelta",
+    "BatchEntry",
+    "BatchForecaster",
+    "BatchResult",
+    "ForecastService",
+    "ForecastServer",
+    "WarmProject",
+    "BenchSweep",
+    "BenchResult",
+    "Regression",
+    "Profile",
     "SprintForecastEngine",
     "SymbolicMetrics",
     "ForecastEngine",
     "Sample",
     "SprintIntake",
+    "IntakeOptimizer",
+    "IntakePlan",
     "Size",
     "TriadFetcher",
-    "DurationExtractor",
     "EmpiricalDistribution",
     "RealSprintForecastEngine",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    mod = _LAZY.get(name)
+    if mod is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{mod}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY))
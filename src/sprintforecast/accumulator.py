@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field
+from typing import Sequence
+
+import numpy as np
+
+from .forecast import ForecastTally
+
+
+# DDSketch: log-spaced buckets keep quantiles within relative_accuracy, and merges are exact
+@dataclass(slots=True)
+class QuantileSketch:
+    relative_accuracy: float = 0.01
+    count: int = 0
+    zeros: int = 0
+    offset: int = 0
+    counts: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.int64))
+
+    def __post_init__(self) -> None:
+        if not 0 < self.relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be in (0, 1)")
+
+    @property
+    def _log_gamma(self) -> float:
+        a = self.relative_accuracy
+        return math.log((1 + a) / (1 - a))
+
+    def _grow(self, lo: int, hi: int) -> None:
+        if self.counts.size == 0:
+            self.offset = lo
+            self.counts = np.zeros(hi - lo + 1, dtype=np.int64)
+            return
+        new_lo = min(lo, self.offset)
+        new_hi = max(hi, self.offset + self.counts.size - 1)
+        if new_lo == self.offset and new_hi == self.offset + self.counts.size - 1:
+            return
+        grown = np.zeros(new_hi - new_lo + 1, dtype=np.int64)
+        start = self.offset - new_lo
+        grown[start : start + self.counts.size] = self.counts
+        self.offset, self.counts = new_lo, grown
+
+    def add(self, values: np.ndarray) -> None:
+        v = np.asarray(values, dtype=float).ravel()
+        # NaN fails every comparison and would otherwise land in the zero bucket
+        if np.isnan(v).any():
+            raise ValueError("sketch does not accept NaN")
+        if np.any(v < 0):
+            raise ValueError("sketch only accepts non-negative values")
+        self.count += v.size
+        pos = v[v > 0]
+        self.zeros += v.size - pos.size
+        if pos.size == 0:
+            return
+        keys = np.ceil(np.log(pos) / self._log_gamma).astype(np.int64)
+        lo, hi = int(keys.min()), int(keys.max())
+        self._grow(lo, hi)
+        self.counts += np.bincount(keys - self.offset, minlength=self.counts.size)
+
+    def merge(self, other: QuantileSketch) -> None:
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("cannot merge sketches with different accuracy")
+        self.count += other.count
+        self.zeros += other.zeros
+        if other.counts.size == 0:
+            return
+        self._grow(other.offset, other.offset + other.counts.size - 1)
+        start = other.offset - self.offset
+        self.counts[start : start + other.counts.size] += other.counts
+
+    def quantile(self, q: float) -> float:
+        if self.count == 0:
+            raise ValueError("empty sketch")
+        if not 0 <= q <= 1:
+            raise ValueError("q must be in [0, 1]")
+        rank = q * (self.count - 1)
+        if rank < self.zeros:
+            return 0.0
+        cum = self.zeros + np.cumsum(self.counts)
+        i = int(np.searchsorted(cum, rank, side="right"))
+        i = min(i, self.counts.size - 1)
+        gamma = math.exp(self._log_gamma)
+        return 2 * gamma ** (self.offset + i) / (gamma + 1)
+
+
+@dataclass(slots=True)
+class ForecastAccumulator(ForecastTally):
+    makespan: QuantileSketch = field(default_factory=QuantileSketch)
+    carry_counts: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.int64))
+    on_time: np.ndarray | None = None
+
+    def empty(self) -> ForecastAccumulator:
+        return ForecastAccumulator(makespan=QuantileSketch(self.makespan.relative_accuracy))
+
+    def update(self, finish: np.ndarray, span: np.ndarray, remaining_hours: float) -> None:
+        ForecastTally.update(self, finish, span, remaining_hours)
+        self.makespan.add(span)
+        late = (finish > remaining_hours).sum(axis=1)
+        self._add_carry(np.bincount(late, minlength=finish.shape[1] + 1))
+        hits = (finish <= remaining_hours).sum(axis=0)
+        self.on_time = hits if self.on_time is None else self.on_time + hits
+
+    def _add_carry(self, counts: np.ndarray) -> None:
+        if counts.size > self.carry_counts.size:
+            counts = counts.copy()
+            counts[: self.carry_counts.size] += self.carry_counts
+            self.carry_counts = counts
+        else:
+            self.carry_counts[: counts.size] += counts
+
+    def merge(self, other: ForecastTally) -> None:
+        if not isinstance(other, ForecastAccumulator):
+            raise TypeError("can only merge another ForecastAccumulator")
+        ForecastTally.merge(self, other)
+        self.makespan.merge(other.makespan)
+        self._add_carry(other.carry_counts)
+        if other.on_time is not None:
+            self.on_time = other.on_time.copy() if self.on_time is None else self.on_time + other.on_time
+
+    def makespan_quantiles(self, qs: Sequence[float] = (0.5, 0.85, 0.95)) -> dict[float, float]:
+        return {q: self.makespan.quantile(q) for q in qs}
+
+    def carry_quantiles(self, qs: Sequence[float] = (0.5, 0.85, 0.95)) -> dict[float, int]:
+        if self.draws == 0:
+            raise ValueError("no draws recorded")
+        cum = np.cumsum(self.carry_counts)
+        return {
+            q: int(np.searchsorted(cum, q * (self.draws - 1), side="right")) for q in qs
+        }
+
+    def ticket_probabilities(self) -> np.ndarray:
+        if self.draws == 0 or self.on_time is None:
+            raise ValueError("no draws recorded")
+        return self.on_time / self.draws
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import math
+import time
+from dataclasses import dataclass, replace
+from statistics import NormalDist
+
+from numpy.random import Generator
+
+from .forecast import ForecastEngine, ForecastResult, ForecastTally
+from .rng_singleton import RNGSingleton
+
+
+def wilson_interval(successes: int, draws: int, confidence: float = 0.95) -> tuple[float, float]:
+    if draws <= 0:
+        return 0.0, 1.0
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    p = successes / draws
+    denom = 1 + z * z / draws
+    centre = (p + z * z / (2 * draws)) / denom
+    half = z * math.sqrt(p * (1 - p) / draws + z * z / (4 * draws * draws)) / denom
+    return max(0.0, centre - half), min(1.0, centre + half)
+
+
+def clopper_pearson_interval(
+    successes: int, draws: int, confidence: float = 0.95
+) -> tuple[float, float]:
+    if draws <= 0:
+        return 0.0, 1.0
+    from scipy.stats import beta as _beta
+
+    tail = (1 - confidence) / 2
+    lo = 0.0 if successes == 0 else float(_beta.ppf(tail, successes, draws - successes + 1))
+    hi = 1.0 if successes == draws else float(_beta.ppf(1 - tail, successes + 1, draws - successes))
+    return lo, hi
+
+
+_INTERVALS = {
+    "wilson": wilson_interval,
+    "clopper-pearson": clopper_pearson_interval,
+}
+
+
+@dataclass(slots=True, frozen=True)
+class AdaptiveForecaster:
+    engine: ForecastEngine
+    tolerance: float | None = 0.01
+    carry_tolerance: float | None = None
+    confidence: float = 0.95
+    method: str = "wilson"
+    chunk: int = 1_000
+    max_draws: int = 1_000_000
+    time_budget: float | None = None
+
+    def __post_init__(self) -> None:
+        if self.method not in _INTERVALS:
+            raise ValueError(f"unknown interval method {self.method!r}")
+        if not 0 < self.confidence < 1:
+            raise ValueError("confidence must be in (0, 1)")
+        if self.chunk <= 0 or self.max_draws < self.chunk:
+            raise ValueError("chunk must be positive and no larger than max_draws")
+
+    def _interval(self, tally: ForecastTally) -> tuple[float, float]:
+        return _INTERVALS[self.method](tally.successes, tally.draws, self.confidence)
+
+    def _converged(self, tally: ForecastTally) -> bool:
+        # a criterion left as None is skipped; with neither set only the budgets stop the run
+        if self.tolerance is None and self.carry_tolerance is None:
+            return False
+        if self.tolerance is not None:
+            lo, hi = self._interval(tally)
+            if (hi - lo) / 2 > self.tolerance:
+                return False
+        return self.carry_tolerance is None or tally.carry_stderr() <= self.carry_tolerance
+
+    def forecast(
+        self, rng: Generator | None = None, tally: ForecastTally | None = None
+    ) -> ForecastResult:
+        if rng is None:
+            rng = getattr(self.engine, "rng", None) or RNGSingleton.rng()
+        tally = ForecastTally() if tally is None else tally
+        start = time.perf_counter()
+        while tally.draws < self.max_draws:
+            self.engine.run(min(self.chunk, self.max_draws - tally.draws), rng, tally)
+            if self._converged(tally):
+                break
+            if self.time_budget is not None and time.perf_counter() - start >= self.time_budget:
+                break
+        return replace(
+            tally.result(),
+            interval=self._interval(tally),
+            elapsed=time.perf_counter() - start,
+        )
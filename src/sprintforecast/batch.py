@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import multiprocessing as mp
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Any, Callable, Mapping, Sequence
+
+from numpy.random import SeedSequence, default_rng
+
+from .accumulator import ForecastAccumulator
+from .adaptive import wilson_interval
+from .forecast import SprintForecastEngine, forecast_engine
+from .github_client import GitHubClient
+from .triad_fetcher import Triad, TriadFetcher, partition_triads
+
+COLUMNS = (
+    "owner", "repo", "project", "tickets", "skipped", "probability", "interval_low",
+    "interval_high", "expected_carry", "makespan_p50", "makespan_p85", "makespan_p95",
+    "draws", "fetch_seconds", "forecast_seconds", "error",
+)
+
+
+@dataclass(slots=True, frozen=True)
+class BatchEntry:
+    owner: str
+    repo: str
+    project: int
+    remaining: float
+    workers: int = 3
+    draws: int = 2_000
+    respect_deps: bool = False
+    reviewers: int | None = None
+
+    def __post_init__(self) -> None:
+        if self.workers <= 0 or self.draws <= 0:
+            raise ValueError(f"{self.owner}/{self.repo}: workers and draws must be positive")
+        if self.respect_deps and self.reviewers is not None:
+            raise ValueError(
+                f"{self.owner}/{self.repo}: reviewers cannot be combined with respect_deps"
+            )
+
+    @classmethod
+    def from_mapping(cls, data: Mapping[str, Any]) -> BatchEntry:
+        reviewers = data.get("reviewers")
+        return cls(
+            owner=str(data["owner"]),
+            repo=str(data["repo"]),
+            project=int(data["project"]),
+            remaining=float(data.get("remaining", data.get("remaining_hours"))),
+            workers=int(data.get("workers", 3)),
+            draws=int(data.get("draws", 2_000)),
+            respect_deps=bool(data.get("respect_deps", False)),
+            reviewers=None if reviewers is None else int(reviewers),
+        )
+
+
+def load_batch(data: Sequence[Mapping[str, Any]] | Mapping[str, Any]) -> list[BatchEntry]:
+    # either a bare list of entries or {"defaults": {...}, "projects": [...]}
+    if isinstance(data, Mapping):
+        defaults, items = dict(data.get("defaults", {})), data.get("projects", [])
+    else:
+        defaults, items = {}, data
+    return [BatchEntry.from_mapping({**defaults, **d}) for d in items]
+
+
+@dataclass(slots=True, frozen=True)
+class BatchResult:
+    entry: BatchEntry
+    tickets: int = 0
+    # issues left out because their estimates break o < m < p
+    skipped: tuple[int, ...] = ()
+    probability: float | None = None
+    interval: tuple[float, float] | None = None
+    expected_carry: float | None = None
+    makespan: Mapping[float, float] = field(default_factory=dict)
+    draws: int = 0
+    fetch_seconds: float = 0.0
+    forecast_seconds: float = 0.0
+    error: str | None = None
+
+    def row(self) -> dict[str, Any]:
+        lo, hi = self.interval or (None, None)
+        return {
+            "owner": self.entry.owner,
+            "repo": self.entry.repo,
+            "project": self.entry.project,
+            "tickets": self.tickets,
+            "skipped": " ".join(map(str, self.skipped)),
+            "probability": self.probability,
+            "interval_low": lo,
+            "interval_high": hi,
+            "expected_carry": self.expected_carry,
+            "makespan_p50": self.makespan.get(0.5),
+            "makespan_p85": self.makespan.get(0.85),
+            "makespan_p95": self.makespan.get(0.95),
+            "draws": self.draws,
+            "fetch_seconds": round(self.fetch_seconds, 3),
+            "forecast_seconds": round(self.forecast_seconds, 3),
+            "error": self.error,
+        }
+
+
+def _run_entry(
+    engine: SprintForecastEngine, draws: int, seed: SeedSequence
+) -> tuple[ForecastAccumulator, float]:
+    start = time.perf_counter()
+    acc = engine.run(draws, default_rng(seed), ForecastAccumulator())
+    return acc, time.perf_counter() - start
+
+
+@dataclass(slots=True, frozen=True)
+class BatchForecaster:
+    fetch: Callable[[BatchEntry], list[Triad]]
+    jobs: int | None = None
+    concurrency: int = 8
+
+    def __post_init__(self) -> None:
+        if self.concurrency <= 0:
+            raise ValueError("concurrency must be positive")
+        if self.jobs is not None and self.jobs <= 0:
+            raise ValueError("jobs must be positive")
+
+    @classmethod
+    def from_client(cls, gh: GitHubClient, **kw: Any) -> BatchForecaster:
+        # one session and connection pool shared by every project
+        return cls(lambda e: TriadFetcher(gh, e.owner, e.repo, e.project).fetch(), **kw)
+
+    def _timed_fetch(self, entry: BatchEntry) -> tuple[list[Triad], float]:
+        start = time.perf_counter()
+        triads = self.fetch(entry)
+        return triads, time.perf_counter() - start
+
+    def run(
+        self, entries: Sequence[BatchEntry], seed: int | SeedSequence | None = None
+    ) -> list[BatchResult]:
+        root = seed if isinstance(seed, SeedSequence) else SeedSequence(seed)
+        seeds = root.spawn(len(entries))
+        results: list[BatchResult | None] = [None] * len(entries)
+        pending: dict[int, tuple[Future, list[Triad], tuple[int, ...], float]] = {}
+        # fetches overlap on threads; each project is handed to the process pool as soon
+        # as its issues arrive, so the portfolio takes about as long as its slowest member
+        io = ThreadPoolExecutor(max_workers=max(1, min(self.concurrency, len(entries))))
+        # jobs=1 keeps the simulations in-process, as ParallelForecaster does; otherwise
+        # workers must not be forked from a process that already runs fetch threads
+        ctx = mp.get_context("forkserver" if "forkserver" in mp.get_all_start_methods() else "spawn")
+        cpu = ThreadPoolExecutor(1) if self.jobs == 1 else ProcessPoolExecutor(self.jobs, ctx)
+        with io, cpu:
+            fetched = {io.submit(self._timed_fetch, e): i for i, e in enumerate(entries)}
+            for fut in as_completed(fetched):
+                i = fetched[fut]
+                entry = entries[i]
+                try:
+                    triads, secs = fut.result()
+                except Exception as exc:
+                    results[i] = BatchResult(entry, error=f"fetch failed: {exc}")
+                    continue
+                # degenerate estimates are skipped and reported, as the CLI does
+                triads, bad = partition_triads(triads)
+                skipped = tuple(t.number for t in bad)
+                if not triads:
+                    results[i] = BatchResult(
+                        entry, skipped=skipped, fetch_seconds=secs,
+                        error="no issues with PERT triads",
+                    )
+                    continue
+                # a dependency cycle fails this project, not the portfolio
+                try:
+                    engine = forecast_engine(
+                        triads, entry.remaining, entry.workers,
+                        respect_deps=entry.respect_deps, reviewers=entry.reviewers,
+                    )
+                    job = cpu.submit(_run_entry, engine, entry.draws, seeds[i])
+                except Exception as exc:
+                    results[i] = BatchResult(
+                        entry, len(triads), skipped, fetch_seconds=secs,
+                        error=f"forecast failed: {exc}",
+                    )
+                    continue
+                pending[i] = (job, triads, skipped, secs)
+            for i, (fut, triads, skipped, secs) in pending.items():
+                entry = entries[i]
+                try:
+                    acc, spent = fut.result()
+                except Exception as exc:
+                    results[i] = BatchResult(
+                        entry, len(triads), skipped, fetch_seconds=secs,
+                        error=f"forecast failed: {exc}",
+                    )
+                    continue
+                res = acc.result()
+                results[i] = BatchResult(
+                    entry,
+                    tickets=len(triads),
+                    skipped=skipped,
+                    probability=res.probability,
+                    interval=wilson_interval(acc.successes, acc.draws),
+                    expected_carry=res.expected_carry,
+                    makespan=acc.makespan_quantiles(),
+                    draws=res.draws,
+                    fetch_seconds=secs,
+                    forecast_seconds=spent,
+                )
+        return [r for r in results if r is not None]
@@ -0,0 +1,328 @@
+from __future__ import annotations
+
+import json
+import platform
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterator, Mapping, Sequence
+
+import numpy as np
+from numpy.random import default_rng
+
+from .distributions import (
+    BetaDistribution,
+    EmpiricalDistribution,
+    GammaDistribution,
+    LogNormalDistribution,
+    SkewTDistribution,
+)
+from .forecast import SprintForecastEngine
+from .queue_simulator import QueueSimulator
+from .real_engine import RealSprintForecastEngine
+from .strategies import CapacityStrategy, ExecutionStrategy, ReviewStrategy
+from .ticket import Ticket
+
+# a case yields (params, thunk, units of work per call) for every point of the sweep,
+# optionally followed by a callable returning counters to keep with the result
+Case = Callable[["BenchSweep"], Iterator[tuple[Any, ...]]]
+
+_DISTRIBUTIONS = {
+    "beta": BetaDistribution(2, 5, 0.1, 1.5),
+    "skewt": SkewTDistribution(0, 0.25, 2, 5),
+    "gamma": GammaDistribution(2.0, 1.5),
+    "lognormal": LogNormalDistribution(1.0, 0.5),
+    "empirical": EmpiricalDistribution(np.linspace(1.0, 12.0, 64)),
+}
+
+
+def _tickets(n: int) -> list[Ticket]:
+    return [Ticket(1, 2 + i % 3, 6 + i % 4) for i in range(n)]
+
+
+def _engine(tickets: int, workers: int, seed: int) -> SprintForecastEngine:
+    return SprintForecastEngine(
+        tickets=_tickets(tickets),
+        exec_strategy=ExecutionStrategy(SkewTDistribution(0, 0.25, 2, 5)),
+        review_strategy=ReviewStrategy(BetaDistribution(2, 5, 0.1, 1.5)),
+        capacity_strategy=CapacityStrategy(BetaDistribution(8, 2, 40, 55)),
+        simulator=QueueSimulator(workers),
+        remaining_hours=3.0 * tickets / workers,
+        rng=default_rng(seed),
+    )
+
+
+def _forecast(s: BenchSweep):
+    for t in s.tickets:
+        for d in s.draws:
+            for w in s.workers:
+                engine = _engine(t, w, s.seed)
+                yield (
+                    {"tickets": t, "draws": d, "workers": w},
+                    lambda engine=engine, d=d: engine.forecast(d),
+                    d,
+                )
+
+
+def _simulate(s: BenchSweep):
+    # the scalar path, one draw per call, as the non-vectorized forecast uses it
+    for t in s.tickets:
+        for w in s.workers:
+            sim = QueueSimulator(w)
+            durations = default_rng(s.seed).gamma(2.0, 2.0, size=(256, t))
+
+            def run(sim=sim, durations=durations) -> None:
+                for row in durations:
+                    sim.simulate(row)
+
+            yield {"tickets": t, "workers": w}, run, durations.shape[0]
+
+
+def _simulate_batch(s: BenchSweep):
+    for t in s.tickets:
+        for d in s.draws:
+            for w in s.workers:
+                sim = QueueSimulator(w)
+                durations = default_rng(s.seed).gamma(2.0, 2.0, size=(d, t))
+                yield (
+                    {"tickets": t, "draws": d, "workers": w},
+                    lambda sim=sim, durations=durations: sim.simulate_batch(durations),
+                    d,
+                )
+
+
+def _sample(name: str) -> Case:
+    def case(s: BenchSweep):
+        dist = _DISTRIBUTIONS[name]
+        for t in s.tickets:
+            for d in s.draws:
+                rng = default_rng(s.seed)
+                yield (
+                    {"tickets": t, "draws": d},
+                    lambda rng=rng, d=d, t=t: dist.sample((d, t), rng=rng),
+                    d * t,
+                )
+
+    return case
+
+
+def _real(s: BenchSweep):
+    for t in s.tickets:
+        for d in s.draws:
+            engine = RealSprintForecastEngine(
+                default_rng(s.seed).gamma(2.0, 2.0, size=t).tolist(), 8.0, rng=default_rng(s.seed)
+            )
+            yield {"tickets": t, "draws": d}, lambda engine=engine, d=d: engine.forecast(d), d
+
+
+def _intake(s: BenchSweep):
+    for t in s.tickets:
+        for d in s.draws:
+            for w in s.workers:
+                engine = _engine(t, w, s.seed)
+                backlog = _tickets(t)
+                cap = 2.0 * t
+
+                def run(engine=engine, backlog=backlog, cap=cap, d=d) -> Any:
+                    rng = default_rng(s.seed)
+                    return engine.suggested_intake(cap, backlog, draws=d, rng=rng)
+
+                yield {"tickets": t, "draws": d, "workers": w}, run, d
+
+
+def _parse(s: BenchSweep):
+    from .dependency_fetcher import DependencyFetcher
+    from .fake_github import FakeRepo
+    from .workflow import WorkflowSpec
+
+    spec = WorkflowSpec.default()
+    for t in s.tickets:
+        repo = FakeRepo.synthetic(issues=t, seed=s.seed)
+        nums = [it["number"] for it in repo.issues]
+        timelines = [repo.timelines[n] for n in nums]
+        deps = {
+            n: {"nodes": [{"source": {"number": n}, "subject": {"number": d}} for d in ds]}
+            for n, ds in repo.deps.items()
+        }
+
+        def run(timelines=timelines, nums=nums, deps=deps) -> None:
+            spec.table_from_timelines(timelines, nums).time_in_state()
+            for n, items in deps.items():
+                DependencyFetcher.parse(n, items)
+
+        yield {"tickets": t}, run, sum(len(tl) for tl in timelines)
+
+
+def _fetch(s: BenchSweep):
+    # the whole client stack against the local stand-in, so no network noise
+    from .fake_github import FakeGitHub, FakeRepo
+    from .github_client import GitHubClient
+    from .triad_fetcher import TriadFetcher
+    from .workflow import WorkflowSpec, fetch_event_table
+
+    for t in s.tickets:
+        repo = FakeRepo.synthetic(issues=t, seed=s.seed)
+        for w in s.workers:
+            # a fresh, effectively unmetered server per point: a shared 5000-request
+            # budget runs low over a sweep and the client's pacing then sleeps in the timing
+            fake = FakeGitHub(repo, limit=10**9)
+            fake.start()
+            gh = GitHubClient("bench", base_url=fake.base_url, pool=w)
+            calls = [0]
+
+            def run(gh=gh, w=w, t=t, owner=fake.owner, name=fake.name, calls=calls) -> None:
+                calls[0] += 1
+                TriadFetcher(gh, owner, name, 1).fetch()
+                fetch_event_table(gh, owner, name, range(1, t + 1), WorkflowSpec.default(), w)
+
+            def stats(fake=fake, gh=gh, calls=calls) -> dict[str, float]:
+                return {
+                    "requests": fake.requests / max(calls[0], 1),
+                    "budget_waited": gh.budget.waited,
+                }
+
+            try:
+                yield {"tickets": t, "workers": w}, run, t, stats
+            finally:
+                fake.stop()
+
+
+CASES: dict[str, Case] = {
+    "forecast": _forecast,
+    "simulate": _simulate,
+    "simulate_batch": _simulate_batch,
+    **{f"sample.{name}": _sample(name) for name in _DISTRIBUTIONS},
+    "real": _real,
+    "intake": _intake,
+    "parse": _parse,
+    "fetch": _fetch,
+}
+
+
+@dataclass(slots=True, frozen=True)
+class BenchResult:
+    case: str
+    params: Mapping[str, int]
+    seconds: float
+    units: int
+    peak_bytes: int | None = None
+    counters: Mapping[str, float] = field(default_factory=dict)
+
+    @property
+    def key(self) -> str:
+        return self.case + "[" + ",".join(f"{k}={v}" for k, v in sorted(self.params.items())) + "]"
+
+    @property
+    def throughput(self) -> float:
+        return self.units / self.seconds if self.seconds > 0 else float("inf")
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "case": self.case,
+            "params": dict(self.params),
+            "seconds": self.seconds,
+            "units": self.units,
+            "peak_bytes": self.peak_bytes,
+            "counters": dict(self.counters),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> BenchResult:
+        return cls(
+            str(data["case"]),
+            {k: int(v) for k, v in data["params"].items()},
+            float(data["seconds"]),
+            int(data["units"]),
+            data.get("peak_bytes"),
+            {k: float(v) for k, v in data.get("counters", {}).items()},
+        )
+
+
+@dataclass(slots=True, frozen=True)
+class Regression:
+    key: str
+    baseline: float
+    seconds: float
+
+    @property
+    def ratio(self) -> float:
+        return self.seconds / self.baseline
+
+
+@dataclass(slots=True, frozen=True)
+class BenchSweep:
+    tickets: tuple[int, ...] = (10, 50)
+    draws: tuple[int, ...] = (1_000, 10_000)
+    workers: tuple[int, ...] = (2, 5)
+    repeat: int = 3
+    cases: tuple[str, ...] = field(default_factory=lambda: tuple(CASES))
+    memory: bool = True
+    seed: int = 0
+
+    def __post_init__(self) -> None:
+        unknown = [c for c in self.cases if c not in CASES]
+        if unknown:
+            raise ValueError(f"unknown bench cases {unknown}; choose from {sorted(CASES)}")
+        if self.repeat <= 0:
+            raise ValueError("repeat must be positive")
+        for name in ("tickets", "draws", "workers"):
+            values = getattr(self, name)
+            if not values or min(values) <= 0:
+                raise ValueError(f"{name} must be a non-empty list of positive integers")
+
+    def run(self, progress: Callable[[BenchResult], None] | None = None) -> list[BenchResult]:
+        out: list[BenchResult] = []
+        for name in self.cases:
+            for params, thunk, units, *stats in CASES[name](self):
+                # one untimed call warms caches and lazy imports
+                thunk()
+                best = float("inf")
+                for _ in range(self.repeat):
+                    start = time.perf_counter()
+                    thunk()
+                    best = min(best, time.perf_counter() - start)
+                peak = None
+                if self.memory:
+                    # traced separately: tracemalloc slows allocation-heavy code down
+                    tracemalloc.start()
+                    try:
+                        thunk()
+                        peak = tracemalloc.get_traced_memory()[1]
+                    finally:
+                        tracemalloc.stop()
+                counters = stats[0]() if stats else {}
+                res = BenchResult(name, params, best, units, peak, counters)
+                out.append(res)
+                if progress is not None:
+                    progress(res)
+        return out
+
+
+def save_baseline(results: Sequence[BenchResult], path: str | Path) -> None:
+    payload = {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "results": [r.to_dict() for r in results],
+    }
+    Path(path).write_text(json.dumps(payload, indent=2) + "\n")
+
+
+def load_baseline(path: str | Path) -> list[BenchResult]:
+    data = json.loads(Path(path).read_text())
+    return [BenchResult.from_dict(r) for r in data["results"]]
+
+
+def compare(
+    results: Sequence[BenchResult], baseline: Sequence[BenchResult], threshold: float = 0.25
+) -> list[Regression]:
+    # points missing from either side are not comparable and are skipped
+    if threshold < 0:
+        raise ValueError("threshold must be non-negative")
+    before = {r.key: r.seconds for r in baseline}
+    return [
+        Regression(r.key, before[r.key], r.seconds)
+        for r in results
+        if r.key in before and r.seconds > before[r.key] * (1 + threshold)
+    ]
@@ -1,28 +1,24 @@
 from __future__ import annotations
 
+import json
 import os
 from pathlib import Path
-from typing import List, Tuple
+from typing import TYPE_CHECKING, List, Tuple
 
-import numpy as np
 import typer
 from rich import print
 
-from .queue_simulator import QueueSimulator
-from .strategies import CapacityStrategy, ExecutionStrategy, ReviewStrategy
-from .ticket import Ticket
-from .distributions import (
-    BetaDistribution,
-    SkewTDistribution,
-    LogNormalDistribution,
-)
-from .rng_singleton import RNGSingleton
-from .project_board import ProjectBoard
-from .github_client import GitHubClient
-from .size import Size
-from .triad_fetcher import TriadFetcher
-from .label_durations import extract_label_durations as extract_durations
-from .forecast import SprintForecastEngine
+# only what typer needs to build the command tree is imported here; numpy, scipy,
+# requests and the engine modules load inside the commands that use them
+from .sampling_scheme import SamplingScheme
+
+if TYPE_CHECKING:
+    from requests.adapters import BaseAdapter
+
+    from .forecast import SprintForecastEngine
+    from .github_client import GitHubClient
+    from .local_store import LocalStore
+    from .triad_fetcher import Triad
 
 
 def _require_token(tok: str | None) -> str:
@@ -35,54 +31,212 @@ def _require_token(tok: str | None) -> str:
     raise typer.Exit(1)
 
 
+def _transport() -> BaseAdapter | None:
+    from .transport import RecordingAdapter, ReplayAdapter
+
+    # cassettes let fetch paths be benchmarked and debugged without the network
+    if os.getenv("SPRINTFORECAST_REPLAY"):
+        return ReplayAdapter(os.environ["SPRINTFORECAST_REPLAY"])
+    if os.getenv("SPRINTFORECAST_RECORD"):
+        return RecordingAdapter(os.environ["SPRINTFORECAST_RECORD"])
+    return None
+
+
+def _client(token: str | None, no_cache: bool, pool: int = 16) -> GitHubClient:
+    from .github_client import GitHubClient
+    from .http_cache import HTTPCache, default_cache_path
+
+    cache = None if no_cache else HTTPCache(default_cache_path())
+    return GitHubClient(
+        _require_token(token),
+        base_url=os.getenv("GITHUB_API_URL", "https://api.github.com"),
+        pool=pool,
+        cache=cache,
+        transport=_transport(),
+    )
+
+
+def _source(
+    token: str | None, no_cache: bool, offline: bool, pool: int = 16
+) -> tuple[GitHubClient | None, LocalStore | None]:
+    from .local_store import LocalStore, default_store_path
+
+    if offline:
+        path = default_store_path()
+        if not path.exists():
+            print(f"[bold red]No local store at {path} – run sync first[/]")
+            raise typer.Exit(1)
+        return None, LocalStore(path)
+    return _client(token, no_cache, pool), None
+
+
+def _build_engine(
+    gh: GitHubClient | None,
+    owner: str,
+    repo: str,
+    project: int,
+    remaining: float,
+    workers: int,
+    empirical: bool = False,
+    respect_deps: bool = False,
+    reviewers: int | None = None,
+    sampling: SamplingScheme = SamplingScheme.MC,
+    concurrency: int = 8,
+    store: LocalStore | None = None,
+) -> tuple[list[Triad], SprintForecastEngine]:
+    from .forecast import fit_lognormal, forecast_engine
+    from .label_durations import LABEL_EVENTS, extract_label_durations, label_durations
+    from .rng_singleton import RNGSingleton
+    from .strategies import ExecutionStrategy, ReviewStrategy
+    from .triad_fetcher import TriadFetcher, partition_triads
+
+    if store is not None:
+        triads = store.triads(owner, repo, project)
+    else:
+        triads = TriadFetcher(gh, owner, repo, project).fetch()
+    triads, bad = partition_triads(triads)
+    if bad:
+        nums = ", ".join(f"#{t.number}" for t in bad)
+        print(f"[yellow]Skipping issues whose estimates break o < m < p: {nums}[/]")
+    exec_strategy = review_strategy = None
+    if empirical:
+        nums = [t.number for t in triads]
+        if store is not None:
+            dev, rev = label_durations(store.timelines(owner, repo, nums, LABEL_EVENTS))
+        else:
+            dev, rev = extract_label_durations(gh, owner, repo, nums, concurrency=concurrency)
+        if dev.size + rev.size == 0:
+            print("[yellow]No dev/review label history yet – move a card or run without --empirical[/]")
+            raise typer.Exit(1)
+
+        exec_strategy = ExecutionStrategy(fit_lognormal(dev))
+        review_strategy = ReviewStrategy(fit_lognormal(rev))
+    elif not triads:
+        print("[yellow]No issues with PERT triads found.[/]")
+        raise typer.Exit(1)
+
+    engine = forecast_engine(
+        triads,
+        remaining,
+        workers,
+        respect_deps=respect_deps,
+        reviewers=reviewers,
+        sampling=sampling,
+        exec_strategy=exec_strategy,
+        review_strategy=review_strategy,
+        rng=RNGSingleton.rng(),
+    )
+    return triads, engine
+
+
 app = typer.Typer(add_completion=False, no_args_is_help=True)
 
 
+def _report(prof) -> None:
+    from rich.console import Console
+
+    # stderr, so --format json/csv output on stdout stays parseable
+    err = Console(stderr=True)
+    wall = prof.wall
+    err.print(f"[bold]Profile[/] ({wall:.3f} s wall)")
+    for name, ph in sorted(prof.phases.items(), key=lambda kv: -kv[1].seconds):
+        share = ph.seconds / wall if wall > 0 else 0.0
+        err.print(f"  {name:<26}{ph.calls:>8} ×{ph.seconds:10.3f} s{share:>8.1%}")
+    for name, n in sorted(prof.counters.items()):
+        err.print(f"  {name:<26}{n:>12,.0f}")
+    for name, v in prof.rates().items():
+        err.print(f"  {name:<26}{v:>12,.2f}")
+
+
+@app.callback()
+def main(
+    ctx: typer.Context,
+    profile: bool = typer.Option(
+        False, "--profile", help="Print a per-phase time breakdown and counters on exit"
+    ),
+    profile_json: Path | None = typer.Option(
+        None, help="Also write the profile as JSON (implies --profile)"
+    ),
+    profile_cprofile: Path | None = typer.Option(
+        None, help="Also dump cProfile stats of the main thread for pstats/snakeviz"
+    ),
+):
+    if not (profile or profile_json or profile_cprofile):
+        return
+    from . import profiling
+
+    prof = ctx.with_resource(profiling.profiling())
+
+    def finish() -> None:
+        _report(prof)
+        if profile_json is not None:
+            prof.write(profile_json)
+
+    # close callbacks run last-registered first, so the dump stops before the report
+    ctx.call_on_close(finish)
+    if profile_cprofile is not None:
+        import cProfile
+
+        cp = cProfile.Profile()
+        cp.enable()
+
+        def dump() -> None:
+            cp.disable()
+            cp.dump_stats(profile_cprofile)
+
+        ctx.call_on_close(dump)
+
+
 @app.command()
 def plan(
     owner: str = typer.Option(..., help="GitHub org/user"),
     repo: str = typer.Option(..., help="Repository"),
     project: int = typer.Option(..., help="Project-board number (unused for now)"),
-    team: int = typer.Option(..., help="Developer head-count"),
-    length: int = typer.Option(..., help="Sprint length in days"),
+    team: int = typer.Option(..., min=1, help="Developer head-count"),
+    length: int = typer.Option(..., min=1, help="Sprint length in days"),
+    target: float = typer.Option(0.85, help="Required probability of finishing the intake"),
+    draws: int = typer.Option(2000),
+    respect_deps: bool = typer.Option(
+        False, help="Only take a ticket together with the issues it depends on"
+    ),
+    seed: int | None = typer.Option(None, help="Seed for reproducible draws"),
+    no_cache: bool = typer.Option(False, help="Bypass the on-disk GitHub response cache"),
+    offline: bool = typer.Option(False, help="Read issues from the local store built by sync"),
     token: str | None = typer.Option(None, help="PAT or env GITHUB_TOKEN"),
 ):
-    token = _require_token(token)
-    gh = GitHubClient(token)
-    triads = TriadFetcher(gh, owner, repo, project).fetch()
-    if not triads:
-        print("[yellow]No issues with PERT triads found.[/]")
-        raise typer.Exit(1)
+    import numpy as np
 
-    cap = team * length * 6
+    from .size import Size
 
-    def mean(t: Ticket) -> float:
-        return (t.optimistic + 4 * t.mode + t.pessimistic) / 6
+    gh, store = _source(token, no_cache, offline)
+    triads, engine = _build_engine(
+        gh, owner, repo, project, length * 6, team, respect_deps=respect_deps, store=store
+    )
 
-    triads.sort(key=lambda t: mean(t.ticket))
+    cap = team * length * 6
+    batch = engine.tickets
+    intake = engine.suggested_intake(
+        cap,
+        batch,
+        target=target,
+        draws=draws,
+        rng=np.random.default_rng(seed) if seed is not None else None,
+    )
 
-    buckets: dict[Size, List[Tuple[int, str, Ticket]]] = {s: [] for s in Size}
-    used = 0.0
-    for tr in triads:
-        hrs = mean(tr.ticket)
-        if used + hrs > cap:
-            continue
-        sz = Size.classify(hrs)
-        if sz is Size.XXL:
-            continue
-        buckets[sz].append(tr)
-        used += hrs
-        if used >= cap:
-            break
+    buckets: dict[Size, List[Tuple[int, float]]] = {s: [] for s in Size}
+    for i in intake.selected:
+        buckets[Size(float(batch.size[i]))].append((i, float(batch.mean[i])))
 
-    print(f"[bold]Intake suggestion[/] (capacity {used:.1f} / {cap} h)")
+    p = "n/a" if intake.probability is None else f"{intake.probability:.1%}"
+    print(f"[bold]Intake suggestion[/] (capacity {intake.hours:.1f} / {cap} h, P(finish) {p})")
     for sz in (Size.XS, Size.S, Size.M, Size.L, Size.XL):
         group = buckets[sz]
         if not group:
             continue
         print(f"[cyan]{sz.name}[/] × {len(group)}")
-        for tr in group:
-            print(f"   • #{tr.number} {tr.title} ({mean(tr.ticket):.1f} h)")
+        for i, hrs in group:
+            tr = triads[i]
+            print(f"   • #{tr.number} {tr.title} ({hrs:.1f} h)")
 
 
 @app.command()
@@ -94,48 +248,356 @@ def forecast(
     workers: int = typer.Option(3),
     draws: int = typer.Option(2000),
     empirical: bool = typer.Option(False, help="Use empirical queue times"),
+    seed: int | None = typer.Option(None, help="Seed for reproducible draws"),
+    jobs: int = typer.Option(1, help="Worker processes for sharded draws"),
+    tolerance: float | None = typer.Option(
+        None, help="Stop once the completion-probability interval half-width is below this"
+    ),
+    carry_tolerance: float | None = typer.Option(
+        None, help="Stop once the carry-over standard error is below this"
+    ),
+    time_budget: float | None = typer.Option(None, help="Seconds to spend in adaptive mode"),
+    max_draws: int = typer.Option(1_000_000, help="Upper bound on adaptive draws"),
+    per_ticket: bool = typer.Option(False, help="Show each ticket's on-time probability"),
+    respect_deps: bool = typer.Option(
+        False, help="Do not start a ticket before the issues it depends on are done"
+    ),
+    reviewers: int | None = typer.Option(
+        None, help="Size of a separate reviewer pool (Dev → Review pipeline)"
+    ),
+    sampling: SamplingScheme = typer.Option(
+        SamplingScheme.MC, help="Draw scheme: plain MC, quasi-random or variance-reduced"
+    ),
+    concurrency: int = typer.Option(
+        8, min=1, help="Issue timelines fetched in parallel with --empirical"
+    ),
+    no_cache: bool = typer.Option(False, help="Bypass the on-disk GitHub response cache"),
+    offline: bool = typer.Option(False, help="Read issues from the local store built by sync"),
     token: str | None = typer.Option(None),
 ):
-    token = _require_token(token)
-    gh = GitHubClient(token)
+    import numpy as np
 
-    if empirical:
-        triads = TriadFetcher(gh, owner, repo, project).fetch()
-        nums = [t.number for t in triads]
-        dev, rev = extract_durations(gh, owner, repo, nums)
-        if dev.size + rev.size == 0:
-            print("[yellow]No dev/review label history yet – move a card or run without --empirical[/]")
-            raise typer.Exit(1)
+    from .accumulator import ForecastAccumulator
+    from .adaptive import AdaptiveForecaster
+    from .parallel import ParallelForecaster
+
+    if reviewers is not None and respect_deps:
+        print("[bold red]--reviewers cannot be combined with --respect-deps[/]")
+        raise typer.Exit(1)
+    gh, store = _source(token, no_cache, offline, pool=concurrency)
+    triads, engine = _build_engine(
+        gh, owner, repo, project, remaining, workers, empirical, respect_deps, reviewers, sampling,
+        concurrency, store,
+    )
+
+    acc = ForecastAccumulator()
+    if tolerance is not None or carry_tolerance is not None or time_budget is not None:
+        res = AdaptiveForecaster(
+            engine,
+            tolerance=tolerance,
+            carry_tolerance=carry_tolerance,
+            chunk=min(draws, max_draws),
+            max_draws=max_draws,
+            time_budget=time_budget,
+        ).forecast(np.random.default_rng(seed) if seed is not None else None, acc)
+    elif seed is None and jobs == 1:
+        res = engine.run(draws, engine.rng, acc).result()
+    else:
+        res = ParallelForecaster(engine, workers=jobs).run(draws, seed=seed, tally=acc).result()
+    print(f"Probability of finishing: [bold]{res.probability:.1%}[/]")
+    if res.interval is not None:
+        lo, hi = res.interval
+        print(f"95% interval: {lo:.1%} – {hi:.1%} ({res.draws} draws, {res.elapsed:.2f} s)")
+    print(f"Expected carry-over: {res.expected_carry:.1f} tickets")
+    if res.expected_review_wait is not None:
+        print(f"Mean review-queue wait: {res.expected_review_wait:.1f} h per ticket")
+    span = acc.makespan_quantiles()
+    print(
+        f"Makespan P50/P85/P95: {span[0.5]:.1f} / {span[0.85]:.1f} / {span[0.95]:.1f} h"
+    )
+    carry = acc.carry_quantiles()
+    print(f"Carry-over P50/P85/P95: {carry[0.5]} / {carry[0.85]} / {carry[0.95]} tickets")
+    if per_ticket:
+        for tr, p in zip(triads, acc.ticket_probabilities().tolist()):
+            print(f"   • #{tr.number} {tr.title}: {p:.1%}")
+
+
+@app.command("what-if")
+def what_if(
+    owner: str = typer.Option(...),
+    repo: str = typer.Option(...),
+    project: int = typer.Option(...),
+    remaining: float = typer.Option(..., help="Hours left in sprint"),
+    scenarios: Path = typer.Option(
+        ..., exists=True, readable=True, help="JSON list of scenarios to compare"
+    ),
+    workers: int = typer.Option(3),
+    draws: int = typer.Option(10_000),
+    respect_deps: bool = typer.Option(False),
+    seed: int | None = typer.Option(None, help="Seed for reproducible draws"),
+    no_cache: bool = typer.Option(False, help="Bypass the on-disk GitHub response cache"),
+    offline: bool = typer.Option(False, help="Read issues from the local store built by sync"),
+    token: str | None = typer.Option(None),
+):
+    import numpy as np
 
-        exec_strategy = ExecutionStrategy(
-            LogNormalDistribution(float(np.mean(dev or [1])), float(np.std(dev or [1], ddof=1) or 1))
+    from .scenarios import ScenarioEngine, load_scenarios
+
+    gh, store = _source(token, no_cache, offline)
+    triads, engine = _build_engine(
+        gh, owner, repo, project, remaining, workers, respect_deps=respect_deps, store=store
+    )
+    index = {tr.number: i for i, tr in enumerate(triads)}
+    try:
+        items = load_scenarios(json.loads(scenarios.read_text()), index)
+    except (ValueError, KeyError, TypeError) as exc:
+        print(f"[bold red]Invalid scenario file: {exc}[/]")
+        raise typer.Exit(1)
+    rng = np.random.default_rng(seed) if seed is not None else engine.rng
+    what = ScenarioEngine(engine, draws=draws, rng=rng)
+    for r in what.evaluate_many(items):
+        p, c = r.probability_delta, r.carry_delta
+        print(
+            f"[bold]{r.scenario.name}[/]: {r.probability:.1%} "
+            f"(Δ {p.mean:+.1%}, {p.interval[0]:+.1%} … {p.interval[1]:+.1%}), "
+            f"carry {r.expected_carry:.1f} "
+            f"(Δ {c.mean:+.2f}, {c.interval[0]:+.2f} … {c.interval[1]:+.2f})"
         )
-        review_strategy = ReviewStrategy(
-            LogNormalDistribution(float(np.mean(rev or [1])), float(np.std(rev or [1], ddof=1) or 1))
+
+
+@app.command()
+def sync(
+    owner: str = typer.Option(...),
+    repo: str = typer.Option(...),
+    project: int = typer.Option(...),
+    full: bool = typer.Option(False, help="Ignore the high-water marks and rescan everything"),
+    concurrency: int = typer.Option(8, min=1, help="Issue timelines fetched in parallel"),
+    no_cache: bool = typer.Option(False, help="Bypass the on-disk GitHub response cache"),
+    token: str | None = typer.Option(None),
+):
+    from .local_store import LocalStore, default_store_path
+
+    gh = _client(token, no_cache, pool=concurrency)
+    store = LocalStore(default_store_path())
+    rep = store.sync(gh, owner, repo, project, full=full, concurrency=concurrency)
+    print(
+        f"✅ Synced {rep.issues} changed issues, {rep.triads} triads, "
+        f"{rep.timelines} timelines into {store.path}"
+    )
+
+
+@app.command()
+def durations(
+    owner: str = typer.Option(...),
+    repo: str = typer.Option(...),
+    project: int = typer.Option(...),
+    state: List[str] = typer.Option(
+        [], help="State trigger, e.g. qa=label:qa,status:In QA (repeatable)"
+    ),
+    workflow: Path | None = typer.Option(
+        None, exists=True, readable=True, help="JSON workflow spec: {state: {label|column|status: ...}}"
+    ),
+    concurrency: int = typer.Option(8, min=1, help="Issue timelines fetched in parallel"),
+    no_cache: bool = typer.Option(False, help="Bypass the on-disk GitHub response cache"),
+    offline: bool = typer.Option(False, help="Read issues from the local store built by sync"),
+    token: str | None = typer.Option(None),
+):
+    import numpy as np
+
+    from .triad_fetcher import TriadFetcher
+    from .workflow import WorkflowSpec, fetch_event_table
+
+    try:
+        if workflow is not None:
+            spec = WorkflowSpec.from_mapping(json.loads(workflow.read_text()))
+        elif state:
+            spec = WorkflowSpec.parse(state)
+        else:
+            spec = WorkflowSpec.default()
+    except ValueError as exc:
+        print(f"[bold red]Invalid workflow: {exc}[/]")
+        raise typer.Exit(1)
+    gh, store = _source(token, no_cache, offline, pool=concurrency)
+    if store is not None:
+        nums = [t.number for t in store.triads(owner, repo, project)]
+        table = spec.table_from_timelines(
+            store.timelines(owner, repo, nums, spec.event_types()), nums
         )
-        tickets = [tr.ticket for tr in triads]
     else:
-        triads = TriadFetcher(gh, owner, repo, project).fetch()
-        if not triads:
-            print("[yellow]No issues with PERT triads found.[/]")
-            raise typer.Exit(1)
-        tickets = [tr.ticket for tr in triads]
-        exec_strategy = ExecutionStrategy(SkewTDistribution(0, 0.25, 2, 5))
-        review_strategy = ReviewStrategy(BetaDistribution(2, 5, 0.1, 1.5))
+        nums = [t.number for t in TriadFetcher(gh, owner, repo, project).fetch()]
+        table = fetch_event_table(gh, owner, repo, nums, spec, concurrency)
+    print(f"[bold]Time in state[/] over {len(nums)} issues")
+    for name, hours in table.time_in_state().items():
+        if not hours.size:
+            print(f"[cyan]{name}[/]: no completed cycles")
+            continue
+        p50, p85 = np.quantile(hours, [0.5, 0.85])
+        print(
+            f"[cyan]{name}[/]: {hours.size} cycles, mean {hours.mean():.1f} h, "
+            f"P50 {p50:.1f} h, P85 {p85:.1f} h"
+        )
 
-    engine = SprintForecastEngine(
-        tickets=tickets,
-        exec_strategy=exec_strategy,
-        review_strategy=review_strategy,
-        capacity_strategy=CapacityStrategy(BetaDistribution(8, 2, 40, 55)),
-        simulator=QueueSimulator(workers),
-        remaining_hours=remaining,
-        rng=RNGSingleton.rng(),
+
+@app.command()
+def batch(
+    config: Path = typer.Option(
+        ..., exists=True, readable=True, help="JSON list of owner/repo/project/remaining entries"
+    ),
+    fmt: str = typer.Option("json", "--format", help="Result table format: json or csv"),
+    out: Path | None = typer.Option(None, help="Write the table here instead of stdout"),
+    jobs: int | None = typer.Option(None, min=1, help="Worker processes for the forecasts"),
+    concurrency: int = typer.Option(8, min=1, help="Projects fetched in parallel"),
+    seed: int | None = typer.Option(None, help="Seed for reproducible draws"),
+    no_cache: bool = typer.Option(False, help="Bypass the on-disk GitHub response cache"),
+    offline: bool = typer.Option(False, help="Read issues from the local store built by sync"),
+    token: str | None = typer.Option(None),
+):
+    import csv
+    import io
+
+    from .batch import COLUMNS, BatchForecaster, load_batch
+
+    if fmt not in ("json", "csv"):
+        print(f"[bold red]Unknown format {fmt!r} – use json or csv[/]")
+        raise typer.Exit(1)
+    try:
+        entries = load_batch(json.loads(config.read_text()))
+    except (ValueError, KeyError, TypeError) as exc:
+        print(f"[bold red]Invalid batch file: {exc}[/]")
+        raise typer.Exit(1)
+    gh, store = _source(token, no_cache, offline, pool=concurrency)
+    if store is not None:
+        # the store's connection belongs to this thread, so read everything up front
+        local = {
+            (e.owner, e.repo, e.project): store.triads(e.owner, e.repo, e.project) for e in entries
+        }
+        runner = BatchForecaster(
+            lambda e: local[e.owner, e.repo, e.project], jobs=jobs, concurrency=concurrency
+        )
+    else:
+        runner = BatchForecaster.from_client(gh, jobs=jobs, concurrency=concurrency)
+    results = runner.run(entries, seed=seed)
+
+    rows = [r.row() for r in results]
+    if fmt == "json":
+        text = json.dumps(rows, indent=2) + "\n"
+    else:
+        buf = io.StringIO()
+        writer = csv.DictWriter(buf, fieldnames=COLUMNS, lineterminator="\n")
+        writer.writeheader()
+        writer.writerows(rows)
+        text = buf.getvalue()
+    if out is None:
+        typer.echo(text, nl=False)
+    else:
+        out.write_text(text)
+    for r in results:
+        if r.skipped:
+            nums = ", ".join(f"#{n}" for n in r.skipped)
+            typer.echo(
+                f"{r.entry.owner}/{r.entry.repo}#{r.entry.project}: "
+                f"skipped issues whose estimates break o < m < p: {nums}",
+                err=True,
+            )
+    failed = [r for r in results if r.error]
+    for r in failed:
+        typer.echo(f"{r.entry.owner}/{r.entry.repo}#{r.entry.project}: {r.error}", err=True)
+    if failed:
+        raise typer.Exit(1)
+
+
+@app.command()
+def serve(
+    host: str = typer.Option("127.0.0.1"),
+    port: int = typer.Option(8765),
+    threads: int = typer.Option(8, min=1, help="Requests handled in parallel"),
+    draws: int = typer.Option(4_000, min=1, help="Pre-sampled draws kept per project"),
+    ttl: float = typer.Option(300.0, help="Seconds before a project is refetched in the background"),
+    warm: List[str] = typer.Option(
+        [], help="owner/repo/project to load before accepting requests (repeatable)"
+    ),
+    concurrency: int = typer.Option(8, min=1, help="Issue timelines fetched in parallel"),
+    seed: int | None = typer.Option(None, help="Seed for reproducible draws"),
+    no_cache: bool = typer.Option(False, help="Bypass the on-disk GitHub response cache"),
+    offline: bool = typer.Option(False, help="Read issues from the local store built by sync"),
+    token: str | None = typer.Option(None),
+):
+    from .service import ForecastServer, ForecastService
+
+    gh, store = _source(token, no_cache, offline, pool=max(threads, concurrency))
+    if store is not None:
+        store.close()
+    service = ForecastService(
+        gh, None if store is None else store.path, draws=draws, ttl=ttl,
+        concurrency=concurrency, seed=seed,
     )
+    for item in warm:
+        try:
+            owner, repo, project = item.rsplit("/", 2)
+            service.project(owner, repo, int(project))
+        except (ValueError, LookupError) as exc:
+            print(f"[bold red]Cannot warm {item}: {exc}[/]")
+            raise typer.Exit(1)
+    service.start_refresher()
+    server = ForecastServer((host, port), service, threads)
+    print(f"[bold]Serving[/] on http://{host}:{server.server_address[1]} (/forecast, /plan, /intake)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
 
-    res = engine.forecast(draws)
-    print(f"Probability of finishing: [bold]{res.probability:.1%}[/]")
-    print(f"Expected carry-over: {res.expected_carry:.1f} tickets")
+
+@app.command()
+def bench(
+    tickets: List[int] = typer.Option([10, 50], help="Backlog sizes to sweep (repeatable)"),
+    draws: List[int] = typer.Option([1_000, 10_000], help="Draw counts to sweep (repeatable)"),
+    workers: List[int] = typer.Option([2, 5], help="Worker counts to sweep (repeatable)"),
+    case: List[str] = typer.Option([], help="Only run these cases, e.g. forecast, sample.beta"),
+    repeat: int = typer.Option(3, min=1, help="Timed runs per point; the fastest is kept"),
+    memory: bool = typer.Option(True, help="Trace peak memory with an extra run per point"),
+    save: Path | None = typer.Option(None, help="Write the results as a JSON baseline"),
+    baseline: Path | None = typer.Option(
+        None, exists=True, readable=True, help="Compare against this JSON baseline"
+    ),
+    threshold: float = typer.Option(
+        0.25, min=0.0, help="Allowed slowdown before failing, 0.25 = 25%"
+    ),
+):
+    from rich.markup import escape
+
+    from .bench import CASES, BenchSweep, compare, load_baseline, save_baseline
+
+    try:
+        sweep = BenchSweep(
+            tuple(tickets), tuple(draws), tuple(workers), repeat,
+            tuple(case) or tuple(CASES), memory,
+        )
+    except ValueError as exc:
+        print(f"[bold red]{exc}[/]")
+        raise typer.Exit(1)
+
+    def show(r) -> None:
+        peak = "" if r.peak_bytes is None else f"{r.peak_bytes / 2**20:8.1f} MiB"
+        print(f"{escape(r.key):<42}{r.seconds * 1e3:9.2f} ms{r.throughput:13,.0f}/s{peak}")
+        if r.counters.get("budget_waited"):
+            print(f"[yellow]  rate-limit pacing slept {r.counters['budget_waited']:.2f} s[/]")
+
+    results = sweep.run(show)
+    if save is not None:
+        save_baseline(results, save)
+        print(f"Baseline written to {save}")
+    if baseline is not None:
+        slower = compare(results, load_baseline(baseline), threshold)
+        for r in slower:
+            print(
+                f"[bold red]{escape(r.key)}: {r.seconds * 1e3:.2f} ms "
+                f"vs {r.baseline * 1e3:.2f} ms ({r.ratio:.2f}×)[/]"
+            )
+        if slower:
+            raise typer.Exit(1)
+        print(f"No slowdown beyond {threshold:.0%} of {baseline}")
 
 
 @app.command("post-note")
@@ -144,6 +606,9 @@ def post_note(
     note_path: Path = typer.Option(..., exists=True, readable=True),
     token: str | None = typer.Option(None),
 ):
+    from .github_client import GitHubClient
+    from .project_board import ProjectBoard
+
     token = _require_token(token)
     gh = GitHubClient(token)
     ProjectBoard(gh, column_id).post_note(note_path.read_text())
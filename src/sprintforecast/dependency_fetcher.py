@@ -2,6 +2,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Any
 
+from . import profiling
 from .github_client import GitHubClient
 
 @dataclass(slots=True, frozen=True)
@@ -11,11 +12,10 @@ class DependencyFetcher:
     repo: str
     page: int = 100
 
-    _Q = """
-    query($owner:String!,$repo:String!,$num:Int!,$first:Int!,$after:String){
-      repository(owner:$owner,name:$repo){
-        issue(number:$num){
-          timelineItems(first:$first,after:$after,itemTypes:[CONNECTED_EVENT]){
+    HEADERS = {"Accept": "application/vnd.github.hawkgirl-preview+json"}
+
+    # shared with TriadFetcher, which requests the first page inline
+    EVENTS = """
             pageInfo{endCursor,hasNextPage}
             nodes{
               ... on ConnectedEvent{
@@ -23,16 +23,35 @@ class DependencyFetcher:
                 subject { ... on Issue{ number } }
               }
             }
-          }
+    """
+
+    _Q = """
+    query($owner:String!,$repo:String!,$num:Int!,$first:Int!,$after:String){
+      rateLimit{limit,cost,remaining,resetAt}
+      repository(owner:$owner,name:$repo){
+        issue(number:$num){
+          timelineItems(first:$first,after:$after,itemTypes:[CONNECTED_EVENT]){%s}
         }
       }
     }
-    """
+    """ % EVENTS
+
+    @staticmethod
+    def parse(num: int, items: dict[str, Any]) -> set[int]:
+        deps: set[int] = set()
+        for ev in items["nodes"]:
+            src = (ev.get("source") or {}).get("number")
+            dst = (ev.get("subject") or {}).get("number")
+            if src == num and dst is not None:
+                deps.add(dst)
+        return deps
+
+    def fetch(self, num: int, after: str | None = None) -> set[int]:
+        with profiling.span("fetch.dependencies.issue"):
+            return self._fetch(num, after)
 
-    def fetch(self, num: int) -> set[int]:
+    def _fetch(self, num: int, after: str | None) -> set[int]:
         deps: set[int] = set()
-        after: str | None = None
-        hdr = {"Accept": "application/vnd.github.hawkgirl-preview+json"}
         while True:
             r = self.client.post(
                 "graphql",
@@ -46,16 +65,14 @@ class DependencyFetcher:
                         "after": after,
                     },
                 },
-                headers=hdr,
+                headers=self.HEADERS,
             )
             r.raise_for_status()
             payload: dict[str, Any] = r.json()
             if "errors" in payload:
                 raise RuntimeError(payload["errors"])
             items = payload["data"]["repository"]["issue"]["timelineItems"]
-            for ev in items["nodes"]:
-                if ev["source"]["number"] == num:
-                    deps.add(ev["subject"]["number"])
+            deps |= self.parse(num, items)
             if not items["pageInfo"]["hasNextPage"]:
                 break
             after = items["pageInfo"]["endCursor"]
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Iterable, Mapping, Sequence
+
+import numpy as np
+
+from .queue_simulator import _earliest, _occupy
+
+if TYPE_CHECKING:
+    from .triad_fetcher import Triad
+
+
+@dataclass(slots=True, frozen=True)
+class DependencySimulator:
+    workers: int
+    preds: tuple[tuple[int, ...], ...]
+    _order: np.ndarray = field(init=False, repr=False, compare=False)
+    _level: np.ndarray = field(init=False, repr=False, compare=False)
+    _pred_table: np.ndarray = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        n = len(self.preds)
+        indeg = np.zeros(n, dtype=np.intp)
+        succs: list[list[int]] = [[] for _ in range(n)]
+        for i, ps in enumerate(self.preds):
+            for p in ps:
+                if not 0 <= p < n or p == i:
+                    raise ValueError(f"ticket {i} has invalid predecessor {p}")
+                succs[p].append(i)
+                indeg[i] += 1
+        level = np.zeros(n, dtype=np.intp)
+        order: list[int] = []
+        ready = deque(i for i in range(n) if indeg[i] == 0)
+        while ready:
+            i = ready.popleft()
+            order.append(i)
+            for s in succs[i]:
+                level[s] = max(level[s], level[i] + 1)
+                indeg[s] -= 1
+                if indeg[s] == 0:
+                    ready.append(s)
+        if len(order) != n:
+            cyclic = sorted(set(range(n)) - set(order))
+            raise ValueError(f"dependency cycle among tickets {cyclic}")
+        width = max((len(ps) for ps in self.preds), default=0)
+        table = np.full((n, max(width, 1)), n, dtype=np.intp)
+        for i, ps in enumerate(self.preds):
+            table[i, : len(ps)] = ps
+        object.__setattr__(self, "_order", np.asarray(order, dtype=np.intp))
+        object.__setattr__(self, "_level", level)
+        object.__setattr__(self, "_pred_table", table)
+
+    @classmethod
+    def from_edges(
+        cls, workers: int, n: int, deps: Mapping[int, Iterable[int]]
+    ) -> DependencySimulator:
+        preds = tuple(tuple(sorted(set(deps.get(i, ())))) for i in range(n))
+        return cls(workers, preds)
+
+    @classmethod
+    def from_triads(cls, workers: int, triads: Sequence[Triad]) -> DependencySimulator:
+        index = {tr.number: i for i, tr in enumerate(triads)}
+        deps = {
+            i: [index[d] for d in tr.deps if d in index and d != tr.number]
+            for i, tr in enumerate(triads)
+        }
+        return cls.from_edges(workers, len(triads), deps)
+
+    def subset(self, keep: Sequence[int], workers: int | None = None) -> DependencySimulator:
+        index = {old: new for new, old in enumerate(keep)}
+        preds = tuple(
+            tuple(index[p] for p in self.preds[old] if p in index) for old in keep
+        )
+        return DependencySimulator(self.workers if workers is None else workers, preds)
+
+    @property
+    def order(self) -> np.ndarray:
+        return self._order
+
+    @property
+    def levels(self) -> np.ndarray:
+        return self._level
+
+    def simulate(self, durations: Sequence[float]) -> tuple[np.ndarray, float]:
+        finish, span = self.simulate_batch(np.asarray(durations, dtype=float)[None, :])
+        return finish[0], float(span[0])
+
+    def simulate_batch(self, durations: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        dur = np.asarray(durations, dtype=float)
+        if dur.ndim != 2 or dur.shape[1] != len(self.preds):
+            raise ValueError("durations must be a (draws, tickets) matrix matching the graph")
+        draws, n = dur.shape
+        # longest-first within each precedence level, per draw
+        keys = np.broadcast_to(self._level, dur.shape)
+        order = np.lexsort((-dur, keys), axis=1)
+        # the extra column is a zero finish time that padded predecessor slots point at
+        finish = np.zeros((draws, n + 1))
+        loads = np.zeros((self.workers, draws))
+        rows = np.arange(draws)
+        best = np.empty(draws)
+        for k in range(n):
+            idx = order[:, k]
+            ready = finish[rows[:, None], self._pred_table[idx]].max(axis=1)
+            _earliest(loads, best)
+            t = np.maximum(best, ready) + dur[rows, idx]
+            finish[rows, idx] = t
+            _occupy(loads, best, t)
+        return finish[:, :n], loads.max(axis=0)
@@ -1,45 +1,91 @@
 import math
+from functools import lru_cache
 import numpy as np
-from scipy.stats import beta as _beta, gamma as _gamma
 from dataclasses import dataclass
 
 from .types import Sample
 from numpy.random import Generator
 from typing import Protocol, runtime_checkable
-from typing import Callable, MutableMapping
+from typing import Callable, ClassVar, Literal, MutableMapping, TypeAlias
+
+Param: TypeAlias = float | np.ndarray
+Backend: TypeAlias = Literal["numpy", "scipy"]
+
+
+def _out_shape(size: int | tuple[int, ...], *params: Param) -> int | tuple[int, ...]:
+    # batched parameters sample a (size, *param_shape) block when size is a
+    # draw count, otherwise size must be a full shape they broadcast against
+    shape = np.broadcast_shapes(*(np.shape(p) for p in params))
+    if not shape or not isinstance(size, (int, np.integer)):
+        return size
+    return (int(size), *shape)
 
 @runtime_checkable
 class Distribution(Protocol):
+    dims: ClassVar[int]
+
     def sample(self, size: int | tuple[int, ...] = 1, *, rng: Generator) -> Sample: ...
 
+    def transform(self, u: np.ndarray) -> Sample: ...
+
 
 @dataclass(slots=True, frozen=True)
 class BetaDistribution(Distribution):
-    alpha: float
-    beta: float
-    lower: float
-    upper: float
+    alpha: Param
+    beta: Param
+    lower: Param
+    upper: Param
+    backend: Backend = "numpy"
+    dims: ClassVar[int] = 1
 
     def __post_init__(self) -> None:
-        if self.alpha <= 0 or self.beta <= 0:
+        if np.any(np.less_equal(self.alpha, 0)) or np.any(np.less_equal(self.beta, 0)):
             raise ValueError("shape parameters must be positive")
-        if self.lower >= self.upper:
+        if np.any(np.greater_equal(self.lower, self.upper)):
             raise ValueError("lower bound must be < upper bound")
 
     def sample(self, size: int | tuple[int, ...] = 1, *, rng: Generator) -> Sample:
-        x = _beta.rvs(self.alpha, self.beta, size=size, random_state=rng)
+        size = _out_shape(size, self.alpha, self.beta, self.lower, self.upper)
+        if self.backend == "scipy":
+            # scipy.stats costs most of a second to import, so only pay for it when used
+            from scipy.stats import beta as _beta
+
+            x = _beta.rvs(self.alpha, self.beta, size=size, random_state=rng)
+        else:
+            x = rng.beta(self.alpha, self.beta, size=size)
         return self.lower + (self.upper - self.lower) * x
 
+    def transform(self, u: np.ndarray) -> Sample:
+        from scipy.stats import beta as _beta
+
+        x = _beta.ppf(u[..., 0], self.alpha, self.beta)
+        return self.lower + (self.upper - self.lower) * x
+
+
+@lru_cache(maxsize=32)
+def _skew_t_table(alpha: float, nu: float, points: int = 40_001) -> tuple[np.ndarray, np.ndarray]:
+    # tabulated CDF of the standard skew-t on a sinh-spaced grid (fine in the
+    # body, geometric in the tails); its density is at most twice the Student-t
+    # density, so the t quantile at 1e-12 bounds where the mass lies
+    from scipy.stats import t as _t
+
+    edge = math.asinh(float(-_t.ppf(1e-12, nu)))
+    grid = np.sinh(np.linspace(-edge, edge, points))
+    pdf = 2 * _t.pdf(grid, nu) * _t.cdf(alpha * grid * np.sqrt((nu + 1) / (nu + grid * grid)), nu + 1)
+    cdf = np.concatenate(([0.0], np.cumsum(np.diff(grid) * (pdf[1:] + pdf[:-1]) / 2)))
+    return grid, cdf / cdf[-1]
+
 
 @dataclass(slots=True, frozen=True)
 class SkewTDistribution(Distribution):
-    xi: float           # location  (ξ)
-    omega: float        # scale     (ω)  > 0
-    alpha: float        # skewness  (α)
-    nu: float           # d.o.f.    (ν)  > 0
+    xi: Param           # location  (ξ)
+    omega: Param        # scale     (ω)  > 0
+    alpha: Param        # skewness  (α)
+    nu: Param           # d.o.f.    (ν)  > 0
+    dims: ClassVar[int] = 1
 
     def __post_init__(self) -> None:
-        if self.omega <= 0 or self.nu <= 0:
+        if np.any(np.less_equal(self.omega, 0)) or np.any(np.less_equal(self.nu, 0)):
             raise ValueError("scale and degrees-of-freedom must be positive")
 
     def sample(
@@ -48,47 +94,83 @@ class SkewTDistribution(Distribution):
         *,
         rng: Generator,
     ) -> Sample:
-        delta = self.alpha / math.sqrt(1.0 + self.alpha * self.alpha)
+        size = _out_shape(size, self.xi, self.omega, self.alpha, self.nu)
+        delta = self.alpha / np.sqrt(1.0 + np.square(self.alpha))
 
         w = rng.chisquare(self.nu, size) / self.nu
 
         z0 = rng.standard_normal(size)
         z1 = rng.standard_normal(size)
 
-        t = (delta * np.abs(z0) + math.sqrt(1.0 - delta * delta) * z1) / np.sqrt(w)
+        t = (delta * np.abs(z0) + np.sqrt(1.0 - delta * delta) * z1) / np.sqrt(w)
+
+        return self.xi + self.omega * t
 
+    def transform(self, u: np.ndarray) -> Sample:
+        u0 = u[..., 0]
+        if np.ndim(self.alpha) == 0 and np.ndim(self.nu) == 0:
+            grid, cdf = _skew_t_table(float(self.alpha), float(self.nu))
+            return self.xi + self.omega * np.interp(u0, cdf, grid)
+        alpha, nu, u0 = np.broadcast_arrays(self.alpha, self.nu, u0)
+        t = np.empty(u0.shape)
+        pairs = np.stack([alpha.ravel(), nu.ravel()], axis=1)
+        keys, inverse = np.unique(pairs, axis=0, return_inverse=True)
+        inverse = inverse.reshape(u0.shape)
+        for k, (a, n) in enumerate(keys.tolist()):
+            grid, cdf = _skew_t_table(a, n)
+            hit = inverse == k
+            t[hit] = np.interp(u0[hit], cdf, grid)
         return self.xi + self.omega * t
 
 
 @dataclass(slots=True, frozen=True)
 class GammaDistribution(Distribution):
-    shape: float
-    scale: float
+    shape: Param
+    scale: Param
+    backend: Backend = "numpy"
+    dims: ClassVar[int] = 1
 
     def __post_init__(self) -> None:
-        if self.shape <= 0 or self.scale <= 0:
+        if np.any(np.less_equal(self.shape, 0)) or np.any(np.less_equal(self.scale, 0)):
             raise ValueError("shape and scale must be positive")
 
     def sample(self, size: int | tuple[int, ...] = 1, *, rng: Generator) -> Sample:
-        return _gamma.rvs(self.shape, loc=0.0, scale=self.scale, size=size, random_state=rng)
+        size = _out_shape(size, self.shape, self.scale)
+        if self.backend == "scipy":
+            from scipy.stats import gamma as _gamma
+
+            return _gamma.rvs(self.shape, loc=0.0, scale=self.scale, size=size, random_state=rng)
+        return rng.gamma(self.shape, self.scale, size=size)
+
+    def transform(self, u: np.ndarray) -> Sample:
+        from scipy.stats import gamma as _gamma
+
+        return _gamma.ppf(u[..., 0], self.shape, scale=self.scale)
 
 
 @dataclass(slots=True, frozen=True)
 class LogNormalDistribution(Distribution):
-    mu: float
-    sigma: float
+    mu: Param
+    sigma: Param
+    dims: ClassVar[int] = 1
 
     def __post_init__(self) -> None:
-        if self.sigma <= 0:
+        if np.any(np.less_equal(self.sigma, 0)):
             raise ValueError("sigma must be positive")
 
     def sample(self, size: int | tuple[int, ...] = 1, *, rng: Generator) -> Sample:
-        return rng.lognormal(self.mu, self.sigma, size=size)
+        return rng.lognormal(self.mu, self.sigma, size=_out_shape(size, self.mu, self.sigma))
+
+    def transform(self, u: np.ndarray) -> Sample:
+        from scipy.stats import norm as _norm
+
+        return np.exp(self.mu + self.sigma * _norm.ppf(u[..., 0]))
 
 
 @dataclass(slots=True, frozen=True)
 class EmpiricalDistribution(Distribution):
     samples: np.ndarray
+    dims: ClassVar[int] = 1
 
     def sample(
         self,
@@ -98,6 +180,11 @@ class EmpiricalDistribution(Distribution):
     ):
         return rng.choice(self.samples, size=size, replace=True)
 
+    def transform(self, u: np.ndarray) -> Sample:
+        ordered = np.sort(np.asarray(self.samples, dtype=float))
+        idx = np.minimum((u[..., 0] * ordered.size).astype(np.intp), ordered.size - 1)
+        return ordered[idx]
+
 class DistributionFactory:
     _registry: MutableMapping[str, type[Distribution]] = {}
 
@@ -109,9 +196,17 @@ class DistributionFactory:
 
         return decorator
 
+    @staticmethod
+    def _coerce(value):
+        if isinstance(value, (list, tuple, np.ndarray)):
+            return np.asarray(value, dtype=float)
+        return value
+
     @classmethod
     def create(cls, name: str, *args, **kwargs) -> Distribution:
         dist_cls = cls._registry[name.lower()]
+        args = tuple(cls._coerce(a) for a in args)
+        kwargs = {k: cls._coerce(v) for k, v in kwargs.items()}
         return dist_cls(*args, **kwargs)
     
 DistributionFactory.register("beta")(BetaDistribution)
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Iterable, Sequence
+
+import numpy as np
+
+STAGES = ("dev", "review")
+
+
+@dataclass(slots=True, frozen=True)
+class EventTable:
+    issue: np.ndarray
+    stage: np.ndarray
+    enter: np.ndarray
+    time: np.ndarray
+    stages: tuple[str, ...] = STAGES
+
+    @classmethod
+    def empty(cls, stages: Sequence[str] = STAGES) -> EventTable:
+        return cls(
+            np.empty(0, dtype=np.int32),
+            np.empty(0, dtype=np.int8),
+            np.empty(0, dtype=bool),
+            np.empty(0, dtype="datetime64[ms]"),
+            tuple(stages),
+        )
+
+    @classmethod
+    def from_rows(
+        cls, rows: Iterable[tuple[int, int, bool, str]], stages: Sequence[str] = STAGES
+    ) -> EventTable:
+        cols = list(zip(*rows))
+        if not cols:
+            return cls.empty(stages)
+        issue, stage, enter, ts = cols
+        # one vectorized parse; GitHub stamps are UTC with a trailing Z
+        stamps = np.char.rstrip(np.asarray(ts, dtype=str), "Z").astype("datetime64[ms]")
+        return cls(
+            np.asarray(issue, dtype=np.int32),
+            np.asarray(stage, dtype=np.int8),
+            np.asarray(enter, dtype=bool),
+            stamps,
+            tuple(stages),
+        )
+
+    @classmethod
+    def concat(cls, tables: Sequence[EventTable]) -> EventTable:
+        if not tables:
+            return cls.empty()
+        stages = tables[0].stages
+        if any(t.stages != stages for t in tables):
+            raise ValueError("event tables track different stages")
+        return cls(
+            np.concatenate([t.issue for t in tables]),
+            np.concatenate([t.stage for t in tables]),
+            np.concatenate([t.enter for t in tables]),
+            np.concatenate([t.time for t in tables]),
+            stages,
+        )
+
+    def __len__(self) -> int:
+        return self.issue.size
+
+    @property
+    def nbytes(self) -> int:
+        return self.issue.nbytes + self.stage.nbytes + self.enter.nbytes + self.time.nbytes
+
+    def durations(self, stage: str) -> np.ndarray:
+        m = self.stage == self.stages.index(stage)
+        issue, enter, t = self.issue[m], self.enter[m], self.time[m]
+        # stable sort keeps the feed order for events sharing a timestamp
+        order = np.lexsort((t, issue))
+        issue, enter, t = issue[order], enter[order], t[order]
+        # every entry directly followed by an exit of the same issue is one cycle;
+        # repeated entries restart the clock and stray exits are ignored
+        cycle = enter[:-1] & ~enter[1:] & (issue[:-1] == issue[1:])
+        return (t[1:][cycle] - t[:-1][cycle]) / np.timedelta64(1, "h")
+
+    def stage_durations(self) -> tuple[np.ndarray, ...]:
+        spent = self.time_in_state()
+        return tuple(spent[s] for s in self.stages)
+
+    def time_in_state(self) -> dict[str, np.ndarray]:
+        # same pairing as durations, for every stage in one sort
+        order = np.lexsort((self.time, self.stage, self.issue))
+        issue, stage = self.issue[order], self.stage[order]
+        enter, t = self.enter[order], self.time[order]
+        cycle = (
+            enter[:-1] & ~enter[1:] & (issue[:-1] == issue[1:]) & (stage[:-1] == stage[1:])
+        )
+        hours = (t[1:][cycle] - t[:-1][cycle]) / np.timedelta64(1, "h")
+        which = stage[:-1][cycle]
+        return {s: hours[which == k] for k, s in enumerate(self.stages)}
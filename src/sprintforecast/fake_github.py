@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+import numpy as np
+
+_EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _stamp(hours: float) -> str:
+    return (_EPOCH + timedelta(hours=float(hours))).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+@dataclass(slots=True)
+class FakeRepo:
+    issues: list[dict[str, Any]]
+    timelines: dict[int, list[dict[str, Any]]]
+    triads: dict[int, tuple[float, float, float]]
+    deps: dict[int, list[int]]
+
+    @classmethod
+    def synthetic(
+        cls,
+        issues: int = 200,
+        cycles: int = 2,
+        deps: int = 2,
+        triad_share: float = 0.8,
+        seed: int = 0,
+    ) -> FakeRepo:
+        rng = np.random.default_rng(seed)
+        out, timelines, triads, links = [], {}, {}, {}
+        for n in range(1, issues + 1):
+            start = float(rng.uniform(0, 24 * 90))
+            t = start
+            evs: list[dict[str, Any]] = []
+            # each cycle labels and moves the issue through dev, then review
+            for _ in range(cycles):
+                for stage, column, prev in (("dev", "Dev", "Todo"), ("review", "Review", "Dev")):
+                    evs.append({"event": "labeled", "label": {"name": stage}, "created_at": _stamp(t)})
+                    evs.append({
+                        "event": "moved_columns_in_project",
+                        "project_card": {"previous_column_name": prev, "column_name": column},
+                        "created_at": _stamp(t),
+                    })
+                    t += float(rng.gamma(2.0, 4.0 if stage == "dev" else 1.5))
+                    evs.append({"event": "unlabeled", "label": {"name": stage}, "created_at": _stamp(t)})
+            timelines[n] = evs
+            out.append({
+                "number": n,
+                "title": f"Synthetic issue {n}",
+                "state": "open",
+                "updated_at": _stamp(t),
+            })
+            if rng.random() < triad_share:
+                o = float(rng.integers(1, 4))
+                m = o + float(rng.integers(1, 5))
+                triads[n] = (o, m, m + float(rng.integers(1, 9)))
+            if n > 1 and deps:
+                links[n] = sorted({int(d) for d in rng.integers(1, n, size=min(deps, n - 1))})
+        return cls(out, timelines, triads, links)
+
+
+@dataclass(slots=True)
+class FakeGitHub:
+    repo: FakeRepo = field(default_factory=FakeRepo.synthetic)
+    latency: float = 0.0
+    owner: str = "acme"
+    name: str = "widgets"
+    project: int = 1
+    limit: int = 5_000
+    requests: int = 0
+    # most requests in flight at once, to check client-side concurrency bounds
+    peak: int = 0
+    _live: int = field(default=0, repr=False)
+    _remaining: dict[str, int] = field(default_factory=dict, repr=False)
+    _reset: int = field(default=0, repr=False)
+    _server: ThreadingHTTPServer | None = field(default=None, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @property
+    def base_url(self) -> str:
+        if self._server is None:
+            raise RuntimeError("server is not running")
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> str:
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+            def do_GET(self) -> None:
+                fake._serve(self, "GET", b"")
+
+            def do_POST(self) -> None:
+                size = int(self.headers.get("Content-Length", 0))
+                fake._serve(self, "POST", self.rfile.read(size))
+
+        self._reset = int(time.time()) + 3600
+        self._remaining = {"core": self.limit, "graphql": self.limit}
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, args=(0.05,), daemon=True).start()
+        return self.base_url
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> FakeGitHub:
+        self.start()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+    def _spend(self, resource: str, cost: int = 1) -> dict[str, str]:
+        with self._lock:
+            self.requests += 1
+            self._remaining[resource] = max(0, self._remaining[resource] - cost)
+            left = self._remaining[resource]
+        return {
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Remaining": str(left),
+            "X-RateLimit-Reset": str(self._reset),
+            "X-RateLimit-Resource": resource,
+        }
+
+    def _serve(self, h: BaseHTTPRequestHandler, method: str, body: bytes) -> None:
+        with self._lock:
+            self._live += 1
+            self.peak = max(self.peak, self._live)
+        try:
+            self._answer(h, method, body)
+        finally:
+            with self._lock:
+                self._live -= 1
+
+    def _answer(self, h: BaseHTTPRequestHandler, method: str, body: bytes) -> None:
+        if self.latency:
+            time.sleep(self.latency)
+        url = urlsplit(h.path)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        parts = url.path.strip("/").split("/")
+        headers: dict[str, str] = {}
+        if method == "POST" and parts == ["graphql"]:
+            status, payload = 200, self._graphql(json.loads(body or b"{}"))
+            headers.update(self._spend("graphql"))
+        elif method == "GET" and parts[:3] == ["repos", self.owner, self.name] and parts[3:4] == ["issues"]:
+            headers.update(self._spend("core"))
+            if len(parts) == 4:
+                status, payload, link = self._issues(h, url.path, query)
+            elif len(parts) == 6 and parts[5] == "timeline":
+                status, payload, link = self._timeline(h, url.path, int(parts[4]), query)
+            else:
+                status, payload, link = 404, {"message": "Not Found"}, None
+            if link:
+                headers["Link"] = link
+        else:
+            status, payload = 404, {"message": "Not Found"}
+        raw = json.dumps(payload).encode()
+        etag = '"%s"' % hashlib.sha1(raw).hexdigest()
+        if method == "GET" and status == 200:
+            headers["ETag"] = etag
+            if h.headers.get("If-None-Match") == etag:
+                status, raw = 304, b""
+        h.send_response(status)
+        for k, v in headers.items():
+            h.send_header(k, v)
+        h.send_header("Content-Type", "application/json")
+        h.send_header("Content-Length", str(len(raw)))
+        h.end_headers()
+        h.wfile.write(raw)
+
+    def _page(
+        self, h: BaseHTTPRequestHandler, path: str, query: dict[str, str], items: list[Any]
+    ) -> tuple[list[Any], str | None]:
+        per = max(1, min(int(query.get("per_page", 30)), 100))
+        page = max(1, int(query.get("page", 1)))
+        chunk = items[(page - 1) * per : page * per]
+        if page * per >= len(items):
+            return chunk, None
+        host = h.headers.get("Host", "127.0.0.1")
+        nxt = urlencode({**query, "page": page + 1})
+        return chunk, f'<http://{host}{path}?{nxt}>; rel="next"'
+
+    def _issues(self, h: BaseHTTPRequestHandler, path: str, query: dict[str, str]):
+        items = list(self.repo.issues)
+        if "since" in query:
+            items = [it for it in items if it["updated_at"] >= query["since"]]
+        if query.get("sort") == "updated":
+            items.sort(key=lambda it: it["updated_at"], reverse=query.get("direction") != "asc")
+        chunk, link = self._page(h, path, query, items)
+        return 200, chunk, link
+
+    def _timeline(self, h: BaseHTTPRequestHandler, path: str, num: int, query: dict[str, str]):
+        if num not in self.repo.timelines:
+            return 404, {"message": "Not Found"}, None
+        chunk, link = self._page(h, path, query, self.repo.timelines[num])
+        return 200, chunk, link
+
+    def _connected(self, num: int, first: int, after: str | None) -> dict[str, Any]:
+        deps = self.repo.deps.get(num, [])
+        start = int(after or 0)
+        end = start + first
+        return {
+            "pageInfo": {"endCursor": str(end), "hasNextPage": end < len(deps)},
+            "nodes": [{"source": {"number": num}, "subject": {"number": d}} for d in deps[start:end]],
+        }
+
+    def _graphql(self, req: dict[str, Any]) -> dict[str, Any]:
+        q, v = req.get("query", ""), req.get("variables") or {}
+        rate = {
+            "limit": self.limit,
+            "cost": 1,
+            "remaining": self._remaining.get("graphql", self.limit),
+            "resetAt": datetime.fromtimestamp(self._reset, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        }
+        if "issue(number" in q:
+            items = self._connected(int(v["num"]), int(v["first"]), v.get("after"))
+            return {"data": {"rateLimit": rate, "repository": {"issue": {"timelineItems": items}}}}
+        if "issues(" not in q:
+            return {"errors": [{"message": "unsupported query"}]}
+        # the triad query asks for states:OPEN
+        issues = [it for it in self.repo.issues if it.get("state", "open") == "open"]
+        if (v.get("order") or {}).get("field") == "UPDATED_AT":
+            issues.sort(key=lambda it: it["updated_at"], reverse=v["order"].get("direction") == "DESC")
+        start = int(v.get("after") or 0)
+        end = start + int(v["first"])
+        nodes = []
+        for it in issues[start:end]:
+            n = it["number"]
+            values = []
+            if n in self.repo.triads:
+                values = [
+                    {"number": x, "field": {"name": k}} for k, x in zip("omp", self.repo.triads[n])
+                ]
+            nodes.append({
+                "number": n,
+                "title": it["title"],
+                "updatedAt": it["updated_at"],
+                "projectItems": {"nodes": [{"project": {"number": self.project}, "fieldValues": {"nodes": values}}]},
+                "timelineItems": self._connected(n, int(v.get("deps", 25)), None),
+            })
+        page = {"pageInfo": {"endCursor": str(end), "hasNextPage": end < len(issues)}, "nodes": nodes}
+        return {"data": {"rateLimit": rate, "repository": {"issues": page}}}
@@ -1,44 +1,168 @@
 import abc
-from dataclasses import dataclass
+import math
+from dataclasses import dataclass, field, replace
 
+from . import profiling
+from .dependency_simulator import DependencySimulator
+from .distributions import BetaDistribution, LogNormalDistribution, SkewTDistribution
+from .intake_optimizer import IntakeOptimizer
+from .pipeline_simulator import PipelineSimulator
 from .queue_simulator import QueueSimulator
 from .rng_singleton import RNGSingleton
+from .sampling import SamplingScheme, UniformSampler
 from .size import Size
 from .sprint_intake import SprintIntake
 from .strategies import CapacityStrategy, ExecutionStrategy, ReviewStrategy
 from .ticket import Ticket
+from .ticket_batch import TicketBatch
 
 import numpy as np
-from numpy.random import Generator
-from typing import Mapping, Sequence
+from numpy.random import Generator, default_rng
+from typing import TYPE_CHECKING, Mapping, Sequence
+
+if TYPE_CHECKING:
+    from .triad_fetcher import Triad
 
 
 @dataclass(slots=True, frozen=True)
 class ForecastResult:
     probability: float
     expected_carry: float
+    interval: tuple[float, float] | None = None
+    draws: int = 0
+    elapsed: float = 0.0
+    expected_review_wait: float | None = None
+
+@dataclass(slots=True)
+class ForecastTally:
+    draws: int = 0
+    successes: int = 0
+    carried: int = 0
+    carried_sq: int = 0
+    review_wait: float = 0.0
+    reviewed: int = 0
+
+    def empty(self) -> "ForecastTally":
+        return type(self)()
+
+    def update(self, finish: np.ndarray, span: np.ndarray, remaining_hours: float) -> None:
+        per_draw = (finish > remaining_hours).sum(axis=1)
+        self.draws += int(span.size)
+        self.successes += int((span <= remaining_hours).sum())
+        self.carried += int(per_draw.sum())
+        self.carried_sq += int((per_draw * per_draw).sum())
+
+    def add_review_wait(self, wait: np.ndarray) -> None:
+        self.review_wait += float(wait.sum())
+        self.reviewed += int(wait.size)
+
+    def merge(self, other: "ForecastTally") -> None:
+        self.draws += other.draws
+        self.successes += other.successes
+        self.carried += other.carried
+        self.carried_sq += other.carried_sq
+        self.review_wait += other.review_wait
+        self.reviewed += other.reviewed
+
+    def carry_stderr(self) -> float:
+        if self.draws < 2:
+            return float("inf")
+        mean = self.carried / self.draws
+        var = (self.carried_sq - self.draws * mean * mean) / (self.draws - 1)
+        return math.sqrt(max(var, 0.0) / self.draws)
+
+    def result(self) -> ForecastResult:
+        if self.draws == 0:
+            raise ValueError("no draws recorded")
+        return ForecastResult(
+            self.successes / self.draws,
+            self.carried / self.draws,
+            draws=self.draws,
+            expected_review_wait=self.review_wait / self.reviewed if self.reviewed else None,
+        )
+
+def schedule(
+    simulator: QueueSimulator | DependencySimulator | PipelineSimulator,
+    dev: np.ndarray,
+    review: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray | None]:
+    if isinstance(simulator, PipelineSimulator):
+        res = simulator.simulate_batch(dev, review)
+        return res.finish, res.makespan, res.review_wait
+    finish, span = simulator.simulate_batch(dev + review)
+    return finish, span, None
 
 class ForecastEngine(abc.ABC):
     @abc.abstractmethod
     def forecast(self, draws: int) -> ForecastResult: ...
 
+    @abc.abstractmethod
+    def run(self, draws: int, rng: Generator, tally: ForecastTally | None = None) -> ForecastTally: ...
+
 @dataclass(slots=True, frozen=True)
 class SprintForecastEngine(ForecastEngine):
-    tickets: Sequence[Ticket]
+    tickets: Sequence[Ticket] | TicketBatch
     exec_strategy: ExecutionStrategy
     review_strategy: ReviewStrategy
     capacity_strategy: CapacityStrategy
-    simulator: QueueSimulator
+    simulator: QueueSimulator | DependencySimulator | PipelineSimulator
     remaining_hours: float
-    rng: Generator = RNGSingleton.rng()
+    rng: Generator = field(default_factory=RNGSingleton.rng)
+    chunk: int = 4_096
+    sampling: SamplingScheme = SamplingScheme.MC
+    _batch: TicketBatch = field(init=False, repr=False, compare=False)
+    _base: BetaDistribution = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        batch = TicketBatch.coerce(self.tickets)
+        object.__setattr__(self, "_batch", batch)
+        object.__setattr__(self, "_base", batch.base_distribution())
 
     def _sample_durations(self) -> np.ndarray:
-        base = np.array([t.base_distribution().sample(rng=self.rng)[0] for t in self.tickets])
-        error = self.exec_strategy.sample(len(self.tickets), rng=self.rng)
-        review = self.review_strategy.sample(len(self.tickets), rng=self.rng)
+        tb = self._batch
+        base = np.array(
+            [
+                BetaDistribution(a, b, lo, hi).sample(rng=self.rng)[0]
+                for a, b, lo, hi in zip(tb.alpha, tb.beta, tb.optimistic, tb.pessimistic)
+            ]
+        )
+        error = self.exec_strategy.sample(len(tb), rng=self.rng)
+        review = self.review_strategy.sample(len(tb), rng=self.rng)
         return np.exp(error) * base + review
 
-    def forecast(self, draws: int = 2_000) -> ForecastResult:
+    def _sample_stages(self, draws: int, rng: Generator) -> tuple[np.ndarray, np.ndarray]:
+        shape = (draws, len(self._batch))
+        base = self._base.sample(shape, rng=rng)
+        error = np.asarray(self.exec_strategy.sample(shape, rng=rng))
+        review = np.asarray(self.review_strategy.sample(shape, rng=rng))
+        return np.exp(error) * base, review
+
+    def _stage_dims(self) -> tuple[int, int]:
+        return self.exec_strategy.distribution.dims, self.review_strategy.distribution.dims
+
+    def _sampler(self, rng: Generator) -> UniformSampler | None:
+        if self.sampling is SamplingScheme.MC or not len(self._batch):
+            return None
+        de, dr = self._stage_dims()
+        return UniformSampler(self.sampling, len(self._batch) * (1 + de + dr), rng)
+
+    def _transform_stages(self, draws: int, sampler: UniformSampler) -> tuple[np.ndarray, np.ndarray]:
+        tb = self._batch
+        de, dr = self._stage_dims()
+        u = sampler.random(draws).reshape(draws, len(tb), 1 + de + dr)
+        base = self._base.transform(u[..., :1])
+        error = np.asarray(self.exec_strategy.transform(u[..., 1 : 1 + de]))
+        review = np.asarray(self.review_strategy.transform(u[..., 1 + de :]))
+        return np.exp(error) * base, review
+
+    def _stages(
+        self, draws: int, rng: Generator, sampler: UniformSampler | None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        if sampler is None:
+            return self._sample_stages(draws, rng)
+        return self._transform_stages(draws, sampler)
+
+    def _forecast_loop(self, draws: int) -> ForecastResult:
         success = 0
         carry = 0.0
         for _ in range(draws):
@@ -47,45 +171,143 @@ class SprintForecastEngine(ForecastEngine):
             if span <= self.remaining_hours:
                 success += 1
             carry += (finish > self.remaining_hours).sum()
-        return ForecastResult(success / draws, carry / draws)
+        return ForecastResult(success / draws, float(carry) / draws, draws=draws)
 
-    def _mean_hours(self, t: Ticket) -> float:
-        return (t.optimistic + 4 * t.mode + t.pessimistic) / 6
+    def forecast(self, draws: int = 2_000, *, vectorized: bool = True) -> ForecastResult:
+        if draws <= 0:
+            raise ValueError("draws must be positive")
+        if not vectorized:
+            if isinstance(self.simulator, PipelineSimulator):
+                raise ValueError("pipeline simulation needs the vectorized path")
+            if self.sampling is not SamplingScheme.MC:
+                raise ValueError("variance-reduced sampling needs the vectorized path")
+            profiling.count("engine.draws", draws)
+            with profiling.span("engine.loop"):
+                return self._forecast_loop(draws)
+        return self.run(draws, self.rng).result()
 
-    def _bucket(self, h: float) -> Size:
-        for s in Size:
-            if h <= s.value:
-                return s
-        return Size.XXL
+    def run(self, draws: int, rng: Generator, tally: ForecastTally | None = None) -> ForecastTally:
+        tally = ForecastTally() if tally is None else tally
+        profiling.count("engine.draws", draws)
+        sampler = self._sampler(rng)
+        for start in range(0, draws, self.chunk):
+            n = min(self.chunk, draws - start)
+            with profiling.span("engine.sample"):
+                stages = self._stages(n, rng, sampler)
+            with profiling.span("engine.simulate"):
+                finish, span, wait = schedule(self.simulator, *stages)
+                tally.update(finish, span, self.remaining_hours)
+            if wait is not None:
+                tally.add_review_wait(wait)
+        return tally
+
+    def sample_stages(self, draws: int, rng: Generator) -> tuple[np.ndarray, np.ndarray]:
+        if draws <= 0:
+            raise ValueError("draws must be positive")
+        sampler = self._sampler(rng)
+        profiling.count("engine.draws", draws)
+        with profiling.span("engine.sample"):
+            parts = [
+                self._stages(min(self.chunk, draws - start), rng, sampler)
+                for start in range(0, draws, self.chunk)
+            ]
+        return np.concatenate([d for d, _ in parts]), np.concatenate([r for _, r in parts])
 
     def suggested_intake(
         self,
         next_capacity_hours: float,
-        backlog: Sequence[Ticket],
+        backlog: Sequence[Ticket] | TicketBatch,
         carry_hours: float = 0.0,
         allocation: Mapping[Size, float] | None = None,
+        *,
+        target: float = 0.85,
+        draws: int = 2_000,
+        value: Sequence[float] | np.ndarray | None = None,
+        rng: Generator | None = None,
+        stages: tuple[np.ndarray, np.ndarray] | None = None,
+        preds: Sequence[Sequence[int]] | None = None,
     ) -> SprintIntake:
-        alloc = allocation or {
-            Size.XS: 0.05,
-            Size.S: 0.15,
-            Size.M: 0.35,
-            Size.L: 0.30,
-            Size.XL: 0.15,
-        }
+        tb = TicketBatch.coerce(backlog)
+        if preds is not None and len(preds) != len(tb):
+            raise ValueError("preds needs one entry per backlog ticket")
         avail = next_capacity_hours - carry_hours
         buckets: dict[Size, int] = {s: 0 for s in Size}
-        sorted_backlog = sorted(backlog, key=self._mean_hours)
-        used = 0.0
-        quota = {s: avail * alloc[s] for s in alloc}
-        for t in sorted_backlog:
-            h = self._mean_hours(t)
-            b = self._bucket(h)
-            if used + h > avail or b == Size.XXL:
-                continue
-            if buckets[b] * h >= quota[b]:
-                continue
-            buckets[b] += 1
-            used += h
-            if used >= avail:
-                break
-        return SprintIntake(buckets, used)
+        if not len(tb) or avail <= 0:
+            return SprintIntake(buckets, 0.0)
+        sim = self.simulator
+        # the engine's graph indexes its own tickets; any other backlog brings its own or none
+        if isinstance(sim, DependencySimulator) and tb is not self.tickets:
+            sim = (
+                QueueSimulator(sim.workers)
+                if preds is None
+                else DependencySimulator(sim.workers, tuple(tuple(p) for p in preds))
+            )
+        workers = sim.developers if isinstance(sim, PipelineSimulator) else sim.workers
+        sizes = list(Size)
+        groups = caps = None
+        if allocation is not None:
+            groups = np.searchsorted([s.value for s in sizes], tb.size)
+            caps = np.array([avail * allocation.get(s, 0.0) for s in sizes])
+        # pre-sampled (dev, review) draws for this backlog can be reused across calls
+        if stages is None:
+            stages = replace(self, tickets=tb).sample_stages(draws, self.rng if rng is None else rng)
+        dev, review = stages
+        with profiling.span("intake.optimize"):
+            plan = IntakeOptimizer(
+                dev,
+                review,
+                sim,
+                avail / workers,
+                target=target,
+                value=None if value is None else np.asarray(value, dtype=float),
+                eligible=tb.size != Size.XXL.value,
+                groups=groups,
+                caps=caps,
+            ).optimize()
+        for v in tb.size[list(plan.selected)].tolist():
+            buckets[Size(v)] += 1
+        return SprintIntake(
+            buckets,
+            float(tb.mean[list(plan.selected)].sum()),
+            selected=plan.selected,
+            probability=plan.probability,
+        )
+
+
+def fit_lognormal(hours: np.ndarray) -> LogNormalDistribution:
+    # mu and sigma describe log-hours; with no history fall back to a unit log-normal
+    logs = np.log(hours[hours > 0])
+    if not logs.size:
+        logs = np.zeros(1)
+    sd = float(np.std(logs, ddof=1)) if logs.size > 1 else 0.0
+    return LogNormalDistribution(float(np.mean(logs)), sd or 1.0)
+
+
+def forecast_engine(
+    triads: Sequence["Triad"],
+    remaining: float,
+    workers: int,
+    *,
+    respect_deps: bool = False,
+    reviewers: int | None = None,
+    sampling: SamplingScheme = SamplingScheme.MC,
+    exec_strategy: ExecutionStrategy | None = None,
+    review_strategy: ReviewStrategy | None = None,
+    rng: Generator | None = None,
+) -> SprintForecastEngine:
+    return SprintForecastEngine(
+        tickets=TicketBatch.from_triads(triads),
+        exec_strategy=exec_strategy or ExecutionStrategy(SkewTDistribution(0, 0.25, 2, 5)),
+        review_strategy=review_strategy or ReviewStrategy(BetaDistribution(2, 5, 0.1, 1.5)),
+        capacity_strategy=CapacityStrategy(BetaDistribution(8, 2, 40, 55)),
+        simulator=(
+            DependencySimulator.from_triads(workers, triads)
+            if respect_deps
+            else PipelineSimulator(workers, reviewers)
+            if reviewers is not None
+            else QueueSimulator(workers)
+        ),
+        remaining_hours=remaining,
+        rng=rng if rng is not None else default_rng(),
+        sampling=sampling,
+    )
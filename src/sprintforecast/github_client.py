@@ -1,11 +1,22 @@
 import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
 
 from dataclasses import dataclass, field
 
+from . import profiling
+from .http_cache import HTTPCache, cache_key
+from .rate_limit import RateBudget
+
 @dataclass(slots=True, frozen=True)
 class GitHubClient:
     token: str
     base_url: str = "https://api.github.com"
+    pool: int = 16
+    cache: HTTPCache | None = field(default=None, compare=False)
+    budget: RateBudget = field(default_factory=RateBudget, compare=False)
+    transport: BaseAdapter | None = field(default=None, repr=False, compare=False)
+    # REST POSTs and GraphQL mutations are not idempotent; a retry can apply them twice
+    retry_writes: bool = False
     _s: requests.Session = field(init=False, repr=False, compare=False, hash=False)
 
     def __post_init__(self) -> None:
@@ -16,15 +27,86 @@ class GitHubClient:
                 "Accept": "application/vnd.github+json",
             }
         )
+        # one connection per concurrent fetch, so threads never queue on the pool
+        adapter = self.transport or HTTPAdapter(
+            pool_connections=self.pool, pool_maxsize=self.pool
+        )
+        s.mount("https://", adapter)
+        s.mount("http://", adapter)
         object.__setattr__(self, "_s", s)
 
+    def _url(self, path_or_url: str) -> str:
+        if path_or_url.startswith("http"):
+            return path_or_url
+        return f"{self.base_url.rstrip('/')}/{path_or_url.lstrip('/')}"
+
+    def _send(
+        self, method: str, url: str, resource: str, retry: bool = True, **kw
+    ) -> requests.Response:
+        attempt = 0
+        while True:
+            self.budget.acquire(resource)
+            try:
+                with profiling.span(f"http.{resource}"):
+                    r = self._s.request(method, url, **kw)
+            except (requests.ConnectionError, requests.Timeout):
+                delay = self.budget.retry_after(attempt, None) if retry else None
+                if delay is None:
+                    raise
+            else:
+                if profiling.enabled():
+                    profiling.count("http.requests")
+                    profiling.count("http.bytes", len(r.content))
+                self.budget.observe(resource, r)
+                delay = self.budget.retry_after(attempt, r) if retry else None
+                if delay is None:
+                    if resource == "graphql" and r.status_code == 200:
+                        self.budget.observe_graphql(r.json())
+                    return r
+            profiling.count("http.retries")
+            with profiling.span("http.backoff"):
+                self.budget.backoff(delay)
+            attempt += 1
+
     def get(self, path_or_url: str, **kw) -> requests.Response:
-        url = (
-            path_or_url
-            if path_or_url.startswith("http")
-            else f"{self.base_url.rstrip('/')}/{path_or_url.lstrip('/')}"
-        )
-        return self._s.get(url, **kw)
+        url = self._url(path_or_url)
+        if self.cache is None:
+            return self._send("GET", url, "core", **kw)
+        headers = dict(kw.pop("headers", None) or {})
+        key = cache_key("GET", url, kw.get("params"), accept=headers.get("Accept"))
+        hit = self.cache.get(key)
+        # revalidate instead of trusting the copy: 304s are free against the rate limit
+        if hit is not None and hit.etag:
+            headers["If-None-Match"] = hit.etag
+        elif hit is not None and hit.last_modified:
+            headers["If-Modified-Since"] = hit.last_modified
+        r = self._send("GET", url, "core", headers=headers, **kw)
+        if r.status_code == 304 and hit is not None:
+            profiling.count("cache.hits")
+            self.cache.refresh(key)
+            return hit.response()
+        profiling.count("cache.misses")
+        if r.status_code == 200 and ("ETag" in r.headers or "Last-Modified" in r.headers):
+            self.cache.put(key, r)
+        return r
 
     def post(self, path: str, **kw) -> requests.Response:
-        return self._s.post(f"{self.base_url.rstrip('/')}/{path.lstrip('/')}", **kw)
\ No newline at end of file
+        url = self._url(path)
+        body = kw.get("json")
+        query = body.get("query", "") if isinstance(body, dict) else ""
+        resource = "graphql" if path.strip("/").endswith("graphql") else "core"
+        read_only = resource == "graphql" and not query.lstrip().startswith("mutation")
+        retry = read_only or self.retry_writes
+        # GraphQL has no validators, so read-only queries are reused while fresh
+        if self.cache is None or not read_only:
+            return self._send("POST", url, resource, retry, **kw)
+        key = cache_key("POST", url, body=body, accept=(kw.get("headers") or {}).get("Accept"))
+        hit = self.cache.get(key, self.cache.fresh)
+        if hit is not None:
+            profiling.count("cache.hits")
+            return hit.response()
+        profiling.count("cache.misses")
+        r = self._send("POST", url, resource, retry, **kw)
+        if r.status_code == 200 and "errors" not in r.json():
+            self.cache.put(key, r)
+        return r
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Mapping
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+
+def default_cache_path() -> Path:
+    env = os.getenv("SPRINTFORECAST_CACHE")
+    if env:
+        return Path(env)
+    root = os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(root) / "sprintforecast" / "http.sqlite"
+
+
+def cache_key(method: str, url: str, params: Any = None, body: Any = None, accept: str | None = None) -> str:
+    raw = json.dumps([method.upper(), url, params, body, accept], sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+@dataclass(slots=True, frozen=True)
+class CachedResponse:
+    status: int
+    url: str
+    headers: Mapping[str, str]
+    body: bytes
+    stored: float
+
+    @property
+    def etag(self) -> str | None:
+        return self.headers.get("ETag") or self.headers.get("etag")
+
+    @property
+    def last_modified(self) -> str | None:
+        return self.headers.get("Last-Modified") or self.headers.get("last-modified")
+
+    def response(self) -> requests.Response:
+        r = requests.Response()
+        r.status_code = self.status
+        r.url = self.url
+        r.headers = CaseInsensitiveDict(self.headers)
+        r._content = self.body
+        r.encoding = "utf-8"
+        return r
+
+
+@dataclass(slots=True)
+class HTTPCache:
+    path: Path
+    ttl: float = 24 * 3600
+    fresh: float = 300.0
+    max_bytes: int = 256 * 1024 * 1024
+    _db: sqlite3.Connection = field(init=False, repr=False)
+    _lock: threading.Lock = field(init=False, repr=False, default_factory=threading.Lock)
+
+    def __post_init__(self) -> None:
+        self.path = Path(self.path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # fetches run on a thread pool, so share one connection behind a lock
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses(
+                key TEXT PRIMARY KEY,
+                status INTEGER NOT NULL,
+                url TEXT NOT NULL,
+                headers TEXT NOT NULL,
+                body BLOB NOT NULL,
+                stored REAL NOT NULL,
+                used REAL NOT NULL,
+                size INTEGER NOT NULL
+            )
+            """
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_used ON responses(used)")
+
+    def get(self, key: str, max_age: float | None = None) -> CachedResponse | None:
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT status, url, headers, body, stored FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if now - row[4] > self.ttl:
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+            if max_age is not None and now - row[4] > max_age:
+                return None
+            self._db.execute("UPDATE responses SET used = ? WHERE key = ?", (now, key))
+        return CachedResponse(row[0], row[1], json.loads(row[2]), bytes(row[3]), row[4])
+
+    def put(self, key: str, r: requests.Response) -> None:
+        now = time.time()
+        body = r.content
+        headers = json.dumps(dict(r.headers))
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, r.status_code, r.url or "", headers, body, now, now, len(body) + len(headers)),
+            )
+            self._evict()
+
+    def refresh(self, key: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._db.execute("UPDATE responses SET stored = ?, used = ? WHERE key = ?", (now, now, key))
+
+    def _evict(self) -> None:
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # drop least recently used entries until the store fits again
+        excess = total - self.max_bytes
+        for key, size in self._db.execute("SELECT key, size FROM responses ORDER BY used").fetchall():
+            self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            excess -= size
+            if excess <= 0:
+                break
+
+    def size(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
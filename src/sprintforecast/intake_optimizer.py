@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import heapq
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from .dependency_simulator import DependencySimulator
+from .pipeline_simulator import PipelineSimulator
+from .queue_simulator import QueueSimulator
+
+
+@dataclass(slots=True, frozen=True)
+class IntakePlan:
+    selected: tuple[int, ...]
+    probability: float
+    hours: float
+    value: float
+
+
+@dataclass(slots=True, frozen=True)
+class IntakeOptimizer:
+    dev: np.ndarray
+    review: np.ndarray
+    simulator: QueueSimulator | DependencySimulator | PipelineSimulator
+    deadline: float
+    target: float = 0.85
+    value: np.ndarray | None = None
+    eligible: np.ndarray | None = None
+    groups: np.ndarray | None = None
+    caps: np.ndarray | None = None
+    max_checks: int = 64
+    _mean: np.ndarray = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if self.dev.ndim != 2 or self.dev.shape != self.review.shape:
+            raise ValueError("dev and review must be (draws, tickets) matrices of equal shape")
+        if not 0.0 < self.target <= 1.0:
+            raise ValueError("target must be in (0, 1]")
+        if isinstance(self.simulator, DependencySimulator) and len(self.simulator.preds) != self.dev.shape[1]:
+            raise ValueError("dependency graph does not match the backlog")
+        if (self.groups is None) != (self.caps is None):
+            raise ValueError("groups and caps must be given together")
+        object.__setattr__(self, "_mean", (self.dev + self.review).mean(axis=0))
+
+    def _subset(self, keep: list[int]) -> QueueSimulator | DependencySimulator | PipelineSimulator:
+        if isinstance(self.simulator, DependencySimulator):
+            return self.simulator.subset(keep)
+        return self.simulator
+
+    def probability(self, selected: list[int] | tuple[int, ...]) -> float:
+        keep = list(selected)
+        if not keep:
+            return 1.0
+        idx = np.asarray(keep, dtype=np.intp)
+        sim = self._subset(keep)
+        if isinstance(sim, PipelineSimulator):
+            span = sim.simulate_batch(self.dev[:, idx], self.review[:, idx]).makespan
+        else:
+            _, span = sim.simulate_batch(self.dev[:, idx] + self.review[:, idx])
+        return float((span <= self.deadline).mean())
+
+    def _bound(self, dev: np.ndarray, review: np.ndarray) -> np.ndarray:
+        # per-draw lower bound on the makespan: the work spread evenly over the pool
+        sim = self.simulator
+        if isinstance(sim, PipelineSimulator):
+            return np.maximum(dev / sim.developers, review / sim.reviewers)
+        return (dev + review) / sim.workers
+
+    def _order(self, value: np.ndarray) -> np.ndarray:
+        # best value per expected hour first, smaller tickets breaking ties
+        density = value / np.maximum(self._mean, 1e-12)
+        return np.lexsort((self._mean, -density))
+
+    def optimize(self) -> IntakePlan:
+        n = self.dev.shape[1]
+        value = self._mean if self.value is None else np.asarray(self.value, dtype=float)
+        ok = np.ones(n, dtype=bool) if self.eligible is None else np.asarray(self.eligible, dtype=bool)
+        preds = self.simulator.preds if isinstance(self.simulator, DependencySimulator) else None
+        used = None if self.caps is None else np.zeros(len(self.caps))
+        dev_load = np.zeros(self.dev.shape[0])
+        rev_load = np.zeros(self.dev.shape[0])
+        chosen = np.zeros(n, dtype=bool)
+        accepted: list[int] = []
+        rank = np.empty(n, dtype=np.intp)
+        rank[self._order(value)] = np.arange(n)
+        waiting = np.zeros(n, dtype=np.intp)
+        succs: list[list[int]] = [[] for _ in range(n)]
+        if preds is not None:
+            for i, ps in enumerate(preds):
+                waiting[i] = len(ps)
+                for p in ps:
+                    succs[p].append(i)
+        ready = [(int(rank[i]), i) for i in range(n) if ok[i] and waiting[i] == 0]
+        heapq.heapify(ready)
+
+        # screen on the fluid bound, which never rejects a feasible addition;
+        # a ticket becomes a candidate once all of its predecessors are in
+        while ready:
+            _, i = heapq.heappop(ready)
+            if used is not None and used[self.groups[i]] + self._mean[i] > self.caps[self.groups[i]]:
+                continue
+            dv = dev_load + self.dev[:, i]
+            rv = rev_load + self.review[:, i]
+            if (self._bound(dv, rv) <= self.deadline).mean() < self.target:
+                continue
+            dev_load, rev_load = dv, rv
+            chosen[i] = True
+            accepted.append(i)
+            if used is not None:
+                used[self.groups[i]] += self._mean[i]
+            for s in succs[i]:
+                waiting[s] -= 1
+                if waiting[s] == 0 and ok[s]:
+                    heapq.heappush(ready, (int(rank[s]), s))
+
+        # the bound ignores packing losses, so keep the longest prefix that the
+        # scheduler confirms; prefixes of the acceptance order stay closed under deps
+        lo, hi = 0, len(accepted)
+        checks = 0
+        if self.probability(accepted) < self.target:
+            hi -= 1
+            while lo < hi:
+                mid = (lo + hi + 1) // 2
+                checks += 1
+                if self.probability(accepted[:mid]) >= self.target:
+                    lo = mid
+                else:
+                    hi = mid - 1
+            rejected = accepted[lo:]
+            accepted = accepted[:lo]
+            chosen[:] = False
+            chosen[accepted] = True
+            if used is not None:
+                used[:] = 0.0
+                np.add.at(used, self.groups[accepted], self._mean[accepted])
+            # local search: refill with the dropped tickets the scheduler accepts
+            for i in rejected:
+                if checks >= self.max_checks:
+                    break
+                if preds is not None and not all(chosen[p] for p in preds[i]):
+                    continue
+                if used is not None and used[self.groups[i]] + self._mean[i] > self.caps[self.groups[i]]:
+                    continue
+                checks += 1
+                if self.probability(accepted + [i]) >= self.target:
+                    accepted.append(i)
+                    chosen[i] = True
+                    if used is not None:
+                        used[self.groups[i]] += self._mean[i]
+
+        idx = np.asarray(accepted, dtype=np.intp)
+        return IntakePlan(
+            selected=tuple(sorted(accepted)),
+            probability=self.probability(accepted),
+            hours=float(self._mean[idx].sum()),
+            value=float(value[idx].sum()),
+        )
@@ -1,3 +1,4 @@
+from . import profiling
 from .github_client import GitHubClient
 
 from dataclasses import dataclass
@@ -30,9 +31,11 @@ class IssueFetcher:
 
         url: str | None = self._base()
         while url:
-            r = self.client.get(url, params=params)
-            r.raise_for_status()
-            yield from r.json()
+            with profiling.span("fetch.issues.page"):
+                r = self.client.get(url, params=params)
+                r.raise_for_status()
+                page = r.json()
+            yield from page
             url = r.links.get("next", {}).get("url")
             params = None
 
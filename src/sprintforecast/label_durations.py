@@ -1,35 +1,20 @@
-from datetime import datetime
-import numpy as np
-from .timeline_fetcher import TimelineFetcher
+from typing import Any, Mapping, Sequence
 from .github_client import GitHubClient
+from .workflow import LABEL_EVENTS, WorkflowSpec, fetch_event_table
+
+__all__ = ['LABEL_EVENTS', 'extract_label_durations', 'label_durations']
+
+_SPEC = WorkflowSpec.from_labels('dev', 'review')
 
 def extract_label_durations(
     gh: GitHubClient,
     owner: str,
     repo: str,
     nums: list[int],
+    concurrency: int = 8,
 ):
-    tf = TimelineFetcher(gh, owner, repo)
-    dev, rev = [], []
-    for n in nums:
-        di = do = ri = ro = None
-        for ev in tf.iter_events(n, types=['labeled', 'unlabeled']):
-            lab = ev.get('label', {}).get('name', '').lower()
-            ts  = ev['created_at']
-            if lab == 'dev':
-                if ev['event'] == 'labeled':   di = ts
-                else:                          do = ts
-            if lab == 'review':
-                if ev['event'] == 'labeled':   ri = ts
-                else:                          ro = ts
-        if di and do:
-            dev.append(
-                (datetime.fromisoformat(do.rstrip('Z')) -
-                 datetime.fromisoformat(di.rstrip('Z'))).total_seconds()/3600
-            )
-        if ri and ro:
-            rev.append(
-                (datetime.fromisoformat(ro.rstrip('Z')) -
-                 datetime.fromisoformat(ri.rstrip('Z'))).total_seconds()/3600
-            )
-    return np.asarray(dev), np.asarray(rev)
+    return fetch_event_table(gh, owner, repo, nums, _SPEC, concurrency).stage_durations()
+
+
+def label_durations(timelines: Sequence[Sequence[Mapping[str, Any]]]):
+    return _SPEC.table_from_timelines(timelines).stage_durations()
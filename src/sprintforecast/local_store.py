@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable, Mapping, Sequence
+
+from .github_client import GitHubClient
+from .issue_fetcher import IssueFetcher
+from .ticket import Ticket
+from .timeline_fetcher import TimelineFetcher
+from .triad_fetcher import Triad, TriadFetcher
+from .workflow import ALL_EVENTS
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cursors(
+    owner TEXT, repo TEXT, name TEXT, value TEXT,
+    PRIMARY KEY(owner, repo, name)
+);
+CREATE TABLE IF NOT EXISTS issues(
+    owner TEXT, repo TEXT, number INTEGER, title TEXT, state TEXT, updated_at TEXT,
+    PRIMARY KEY(owner, repo, number)
+);
+CREATE TABLE IF NOT EXISTS triads(
+    owner TEXT, repo TEXT, project INTEGER, number INTEGER,
+    title TEXT, optimistic REAL, mode REAL, pessimistic REAL,
+    PRIMARY KEY(owner, repo, project, number)
+);
+CREATE TABLE IF NOT EXISTS deps(
+    owner TEXT, repo TEXT, number INTEGER, dep INTEGER,
+    PRIMARY KEY(owner, repo, number, dep)
+);
+CREATE TABLE IF NOT EXISTS events(
+    owner TEXT, repo TEXT, number INTEGER, seq INTEGER,
+    event TEXT, created_at TEXT, payload TEXT,
+    PRIMARY KEY(owner, repo, number, seq)
+);
+"""
+
+
+def default_store_path() -> Path:
+    env = os.getenv("SPRINTFORECAST_STORE")
+    if env:
+        return Path(env)
+    root = os.getenv("XDG_DATA_HOME") or Path.home() / ".local" / "share"
+    return Path(root) / "sprintforecast" / "store.sqlite"
+
+
+@dataclass(slots=True, frozen=True)
+class SyncReport:
+    issues: int
+    triads: int
+    timelines: int
+
+
+@dataclass(slots=True)
+class LocalStore:
+    path: Path
+    _db: sqlite3.Connection = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.path = Path(self.path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.path)
+        self._db.executescript(_SCHEMA)
+
+    def cursor(self, owner: str, repo: str, name: str) -> str | None:
+        row = self._db.execute(
+            "SELECT value FROM cursors WHERE owner = ? AND repo = ? AND name = ?",
+            (owner, repo, name),
+        ).fetchone()
+        return None if row is None else row[0]
+
+    def set_cursor(self, owner: str, repo: str, name: str, value: str | None) -> None:
+        if value is None:
+            return
+        self._db.execute(
+            "INSERT OR REPLACE INTO cursors VALUES (?, ?, ?, ?)", (owner, repo, name, value)
+        )
+
+    def put_issues(self, owner: str, repo: str, issues: Iterable[Mapping[str, Any]]) -> int:
+        rows = [
+            (owner, repo, it["number"], it.get("title", ""), it.get("state", "open"),
+             it.get("updated_at"))
+            for it in issues
+            if "pull_request" not in it
+        ]
+        self._db.executemany("INSERT OR REPLACE INTO issues VALUES (?, ?, ?, ?, ?, ?)", rows)
+        return len(rows)
+
+    def put_triads(
+        self, owner: str, repo: str, project: int, seen: Sequence[int], triads: Sequence[Triad]
+    ) -> None:
+        # every scanned issue is rewritten, so cleared fields and links disappear too
+        gone = [(owner, repo, n) for n in seen]
+        self._db.executemany(
+            "DELETE FROM triads WHERE owner = ? AND repo = ? AND project = ? AND number = ?",
+            [(owner, repo, project, n) for n in seen],
+        )
+        self._db.executemany("DELETE FROM deps WHERE owner = ? AND repo = ? AND number = ?", gone)
+        self._db.executemany(
+            "INSERT OR REPLACE INTO triads VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (owner, repo, project, tr.number, tr.title,
+                 tr.ticket.optimistic, tr.ticket.mode, tr.ticket.pessimistic)
+                for tr in triads
+            ],
+        )
+        self._db.executemany(
+            "INSERT OR REPLACE INTO deps VALUES (?, ?, ?, ?)",
+            [(owner, repo, tr.number, d) for tr in triads for d in tr.deps],
+        )
+
+    def put_events(
+        self, owner: str, repo: str, number: int, events: Sequence[Mapping[str, Any]]
+    ) -> None:
+        self._db.execute(
+            "DELETE FROM events WHERE owner = ? AND repo = ? AND number = ?", (owner, repo, number)
+        )
+        self._db.executemany(
+            "INSERT INTO events VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                (owner, repo, number, k, ev.get("event"), ev.get("created_at"), json.dumps(ev))
+                for k, ev in enumerate(events)
+            ],
+        )
+
+    def triads(self, owner: str, repo: str, project: int) -> list[Triad]:
+        rows = self._db.execute(
+            """
+            SELECT t.number, t.title, t.optimistic, t.mode, t.pessimistic
+            FROM triads t LEFT JOIN issues i
+              ON i.owner = t.owner AND i.repo = t.repo AND i.number = t.number
+            WHERE t.owner = ? AND t.repo = ? AND t.project = ?
+              AND COALESCE(i.state, 'open') = 'open'
+            ORDER BY t.number
+            """,
+            (owner, repo, project),
+        ).fetchall()
+        deps: dict[int, list[int]] = {}
+        for n, d in self._db.execute(
+            "SELECT number, dep FROM deps WHERE owner = ? AND repo = ? ORDER BY number, dep",
+            (owner, repo),
+        ):
+            deps.setdefault(n, []).append(d)
+        return [
+            Triad(n, title, Ticket(o, m, p), tuple(deps.get(n, ())))
+            for n, title, o, m, p in rows
+        ]
+
+    def timelines(
+        self, owner: str, repo: str, nums: Sequence[int], types: Sequence[str] | None = None
+    ) -> list[list[Mapping[str, Any]]]:
+        out: dict[int, list[Mapping[str, Any]]] = {n: [] for n in nums}
+        for n, ev, payload in self._db.execute(
+            "SELECT number, event, payload FROM events"
+            " WHERE owner = ? AND repo = ? ORDER BY number, seq",
+            (owner, repo),
+        ):
+            if n in out and (not types or ev in types):
+                out[n].append(json.loads(payload))
+        return [out[n] for n in nums]
+
+    def sync(
+        self,
+        gh: GitHubClient,
+        owner: str,
+        repo: str,
+        project: int,
+        *,
+        full: bool = False,
+        concurrency: int = 8,
+    ) -> SyncReport:
+        since = None if full else self.cursor(owner, repo, "issues")
+        params: dict[str, Any] = {"sort": "updated", "direction": "asc"}
+        if since is not None:
+            params["since"] = since
+        # since is inclusive, so drop boundary issues the store already has
+        known = dict(
+            self._db.execute(
+                "SELECT number, updated_at FROM issues WHERE owner = ? AND repo = ?", (owner, repo)
+            ).fetchall()
+        )
+        issues = [
+            it
+            for it in IssueFetcher(gh, owner, repo).fetch(state="all", **params)
+            if "pull_request" not in it and known.get(it["number"]) != it.get("updated_at")
+        ]
+        marks = [it["updated_at"] for it in issues if it.get("updated_at")]
+
+        mark = None if full else self.cursor(owner, repo, f"triads:{project}")
+        triads, seen, mark = TriadFetcher(gh, owner, repo, project).updated(mark)
+
+        # only issues touched since the last sync need their history refetched
+        nums = sorted(it["number"] for it in issues)
+        timelines = TimelineFetcher(gh, owner, repo).fetch_many(
+            nums, types=ALL_EVENTS, concurrency=concurrency
+        )
+        with self._db:
+            self.put_issues(owner, repo, issues)
+            self.put_triads(owner, repo, project, seen, triads)
+            for n, events in zip(nums, timelines):
+                self.put_events(owner, repo, n, events)
+            self.set_cursor(owner, repo, "issues", max(marks, default=since))
+            self.set_cursor(owner, repo, f"triads:{project}", mark)
+        return SyncReport(len(issues), len(triads), len(nums))
+
+    def close(self) -> None:
+        self._db.close()
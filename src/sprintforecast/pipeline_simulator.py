@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Sequence
+
+import numpy as np
+
+from .queue_simulator import QueueSimulator, _earliest, _occupy
+
+
+@dataclass(slots=True, frozen=True)
+class PipelineResult:
+    dev_finish: np.ndarray
+    finish: np.ndarray
+    makespan: np.ndarray
+    review_wait: np.ndarray
+
+
+@dataclass(slots=True, frozen=True)
+class PipelineSimulator:
+    developers: int
+    reviewers: int
+
+    def __post_init__(self) -> None:
+        if self.developers <= 0 or self.reviewers <= 0:
+            raise ValueError("developer and reviewer pools must be non-empty")
+
+    def simulate(
+        self, dev: Sequence[float], review: Sequence[float]
+    ) -> tuple[np.ndarray, float, np.ndarray]:
+        res = self.simulate_batch(
+            np.asarray(dev, dtype=float)[None, :], np.asarray(review, dtype=float)[None, :]
+        )
+        return res.finish[0], float(res.makespan[0]), res.review_wait[0]
+
+    def simulate_batch(self, dev: np.ndarray, review: np.ndarray) -> PipelineResult:
+        dev = np.asarray(dev, dtype=float)
+        review = np.asarray(review, dtype=float)
+        if dev.ndim != 2 or dev.shape != review.shape:
+            raise ValueError("dev and review must be (draws, tickets) matrices of equal shape")
+        draws, n = dev.shape
+        dev_finish, _ = QueueSimulator(self.developers).simulate_batch(dev)
+        # reviews are served first-come first-served in order of dev completion
+        order = np.argsort(dev_finish, axis=1, kind="stable")
+        finish = np.empty_like(dev)
+        wait = np.empty_like(dev)
+        loads = np.zeros((self.reviewers, draws))
+        rows = np.arange(draws)
+        best = np.empty(draws)
+        for k in range(n):
+            idx = order[:, k]
+            ready = dev_finish[rows, idx]
+            _earliest(loads, best)
+            start = np.maximum(best, ready)
+            t = start + review[rows, idx]
+            wait[rows, idx] = start - ready
+            finish[rows, idx] = t
+            _occupy(loads, best, t)
+        return PipelineResult(dev_finish, finish, loads.max(axis=0), wait)
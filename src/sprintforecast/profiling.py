@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, ContextManager, Iterator
+
+# the collector everything reports into; None keeps every hook down to one global lookup
+_active: Profile | None = None
+_OFF = nullcontext()
+
+
+@dataclass(slots=True)
+class Phase:
+    calls: int = 0
+    seconds: float = 0.0
+
+
+@dataclass(slots=True)
+class Profile:
+    phases: dict[str, Phase] = field(default_factory=dict)
+    counters: dict[str, float] = field(default_factory=dict)
+    started: float = field(default_factory=time.perf_counter)
+    stopped: float | None = None
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def add(self, name: str, seconds: float) -> None:
+        with self._lock:
+            ph = self.phases.get(name)
+            if ph is None:
+                ph = self.phases[name] = Phase()
+            ph.calls += 1
+            ph.seconds += seconds
+
+    def count(self, name: str, n: float = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    @property
+    def wall(self) -> float:
+        return (self.stopped or time.perf_counter()) - self.started
+
+    def rates(self) -> dict[str, float]:
+        out: dict[str, float] = {}
+        draws = self.counters.get("engine.draws", 0)
+        busy = sum(
+            ph.seconds for name, ph in self.phases.items() if name.startswith("engine.")
+        )
+        if draws and busy > 0:
+            out["draws_per_second"] = draws / busy
+        lookups = self.counters.get("cache.hits", 0) + self.counters.get("cache.misses", 0)
+        if lookups:
+            out["cache_hit_ratio"] = self.counters.get("cache.hits", 0) / lookups
+        return out
+
+    def to_dict(self) -> dict[str, Any]:
+        with self._lock:
+            phases = {
+                k: {"calls": v.calls, "seconds": v.seconds} for k, v in sorted(self.phases.items())
+            }
+            counters = dict(sorted(self.counters.items()))
+        return {"wall_seconds": self.wall, "phases": phases, "counters": counters, **self.rates()}
+
+    def write(self, path: str | Path) -> None:
+        Path(path).write_text(json.dumps(self.to_dict(), indent=2) + "\n")
+
+
+def enabled() -> bool:
+    return _active is not None
+
+
+def span(name: str) -> ContextManager[None]:
+    prof = _active
+    return _OFF if prof is None else prof.span(name)
+
+
+def count(name: str, n: float = 1) -> None:
+    prof = _active
+    if prof is not None:
+        prof.count(name, n)
+
+
+@contextmanager
+def profiling(profile: Profile | None = None) -> Iterator[Profile]:
+    # process-wide: fetch threads report into the same profile; worker processes do not
+    global _active
+    prof = profile if profile is not None else Profile()
+    previous, _active = _active, prof
+    try:
+        yield prof
+    finally:
+        _active = previous
+        prof.stopped = time.perf_counter()
@@ -4,6 +4,25 @@ import heapq
 from dataclasses import dataclass
 from typing import Sequence
 
+def _earliest(loads: np.ndarray, out: np.ndarray) -> np.ndarray:
+    np.copyto(out, loads[0])
+    for j in range(1, loads.shape[0]):
+        np.minimum(out, loads[j], out=out)
+    return out
+
+
+def _occupy(loads: np.ndarray, best: np.ndarray, until: np.ndarray) -> None:
+    # hand each draw's work to the lowest-index worker that is free earliest,
+    # which is the tie-break heapq gives QueueSimulator.simulate
+    free = np.ones(best.shape, dtype=bool)
+    hit = np.empty(best.shape, dtype=bool)
+    for j in range(loads.shape[0]):
+        np.equal(loads[j], best, out=hit)
+        hit &= free
+        free ^= hit
+        loads[j] = np.where(hit, until, loads[j])
+
+
 @dataclass(slots=True, frozen=True)
 class QueueSimulator:
     workers: int
@@ -19,4 +38,31 @@ class QueueSimulator:
             heapq.heappush(heap, (t, w))
             finish[idx] = t
         makespan = max(t for t, _ in heap)
-        return finish, makespan
\ No newline at end of file
+        return finish, makespan
+
+    def simulate_batch(self, durations: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        dur = np.asarray(durations, dtype=float)
+        if dur.ndim != 2:
+            raise ValueError("durations must be a (draws, tickets) matrix")
+        draws, n = dur.shape
+        order = np.argsort(-dur, axis=1)
+        lpt = np.ascontiguousarray(np.take_along_axis(dur, order, axis=1).T)
+        done = np.empty_like(lpt)
+        loads = np.zeros((self.workers, draws))
+        best = np.empty(draws)
+        free = np.empty(draws, dtype=bool)
+        hit = np.empty(draws, dtype=bool)
+        for k in range(n):
+            _earliest(loads, best)
+            d = lpt[k]
+            np.add(best, d, out=done[k])
+            # same assignment as _occupy, but adding d keeps this hot loop cheaper
+            free.fill(True)
+            for j in range(self.workers):
+                np.equal(loads[j], best, out=hit)
+                hit &= free
+                free ^= hit
+                loads[j] += hit * d
+        finish = np.empty_like(dur)
+        np.put_along_axis(finish, order, done.T, axis=1)
+        return finish, loads.max(axis=0)
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Mapping
+
+from requests import Response
+
+
+@dataclass(slots=True, frozen=True)
+class RateStats:
+    requests: int
+    retries: int
+    waits: int
+    waited: float
+    secondary: int
+    server_errors: int
+    graphql_cost: int
+    remaining: Mapping[str, int]
+
+
+@dataclass(slots=True)
+class RateBudget:
+    reserve: int = 20
+    pace_below: float = 0.1
+    max_retries: int = 5
+    base_delay: float = 1.0
+    max_delay: float = 60.0
+    clock: Callable[[], float] = field(default=time.time, repr=False)
+    sleep: Callable[[float], None] = field(default=time.sleep, repr=False)
+    rng: random.Random = field(default_factory=random.Random, repr=False)
+    requests: int = 0
+    retries: int = 0
+    waits: int = 0
+    waited: float = 0.0
+    secondary: int = 0
+    server_errors: int = 0
+    graphql_cost: int = 0
+    # resource -> (limit, remaining, reset epoch seconds), shared by every thread
+    _limits: dict[str, tuple[int, int, float]] = field(default_factory=dict, repr=False)
+    # earliest clock time the next paced request may go out, shared by every thread
+    _next_at: float = field(default=0.0, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def _pause(self, seconds: float) -> None:
+        if seconds <= 0:
+            return
+        with self._lock:
+            self.waits += 1
+            self.waited += seconds
+        self.sleep(seconds)
+
+    def acquire(self, resource: str) -> None:
+        with self._lock:
+            self.requests += 1
+            state = self._limits.get(resource)
+            if state is None:
+                return
+            limit, remaining, reset = state
+            now = self.clock()
+            if reset <= now:
+                del self._limits[resource]
+                return
+            # claim the slot up front so concurrent callers see the shrinking budget
+            self._limits[resource] = (limit, remaining - 1, reset)
+            if remaining <= self.reserve:
+                at = reset + 1.0
+            elif remaining < limit * self.pace_below:
+                # book slots one interval apart so paced threads do not wake in a burst
+                gap = (reset - now) / (remaining - self.reserve)
+                at = self._next_at = max(now, self._next_at) + gap
+            else:
+                return
+        self._pause(at - now)
+
+    def _update(self, resource: str, limit: int, remaining: int, reset: float) -> None:
+        with self._lock:
+            old = self._limits.get(resource)
+            # responses can land out of order; keep the most pessimistic view per window
+            if old is not None and old[2] == reset:
+                remaining = min(remaining, old[1])
+            self._limits[resource] = (limit, remaining, reset)
+
+    def observe(self, resource: str, r: Response) -> None:
+        h = r.headers
+        if "X-RateLimit-Remaining" not in h or "X-RateLimit-Reset" not in h:
+            return
+        self._update(
+            h.get("X-RateLimit-Resource", resource),
+            int(h.get("X-RateLimit-Limit", 0)),
+            int(h["X-RateLimit-Remaining"]),
+            float(h["X-RateLimit-Reset"]),
+        )
+
+    def observe_graphql(self, payload: Mapping[str, Any]) -> None:
+        rate = (payload.get("data") or {}).get("rateLimit")
+        if not rate:
+            return
+        reset = datetime.fromisoformat(rate["resetAt"].replace("Z", "+00:00")).timestamp()
+        with self._lock:
+            self.graphql_cost += int(rate.get("cost", 0))
+        self._update("graphql", int(rate.get("limit", 0)), int(rate["remaining"]), reset)
+
+    def retry_after(self, attempt: int, r: Response | None) -> float | None:
+        if attempt >= self.max_retries:
+            return None
+        backoff = min(self.max_delay, self.base_delay * 2**attempt)
+        # full jitter keeps a pool of threads from retrying in lockstep
+        jittered = self.rng.uniform(0.0, backoff)
+        if r is None:
+            return jittered
+        if r.status_code in (403, 429):
+            if r.headers.get("Retry-After"):
+                with self._lock:
+                    self.secondary += 1
+                return float(r.headers["Retry-After"])
+            if r.headers.get("X-RateLimit-Remaining") == "0":
+                return max(0.0, float(r.headers.get("X-RateLimit-Reset", 0)) - self.clock()) + 1.0
+            # secondary limits without Retry-After: at least a minute, then exponential
+            if r.status_code == 429 or "secondary rate limit" in r.text.lower():
+                with self._lock:
+                    self.secondary += 1
+                return 60.0 * 2**attempt + jittered
+            return None
+        if r.status_code >= 500:
+            with self._lock:
+                self.server_errors += 1
+            return jittered
+        return None
+
+    def backoff(self, seconds: float) -> None:
+        with self._lock:
+            self.retries += 1
+        self._pause(seconds)
+
+    def stats(self) -> RateStats:
+        with self._lock:
+            return RateStats(
+                self.requests,
+                self.retries,
+                self.waits,
+                self.waited,
+                self.secondary,
+                self.server_errors,
+                self.graphql_cost,
+                {k: v[1] for k, v in self._limits.items()},
+            )
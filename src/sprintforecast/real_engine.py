@@ -1,28 +1,43 @@
 from __future__ import annotations
 import numpy as np
-from dataclasses import dataclass
-from typing import Sequence
+from dataclasses import dataclass, field
+from typing import Iterator, Sequence
 from numpy.random import Generator
+from . import profiling
 from .rng_singleton import RNGSingleton
-from .forecast import ForecastEngine, ForecastResult
+from .forecast import ForecastEngine, ForecastResult, ForecastTally
 
 @dataclass(slots=True, frozen=True)
 class RealSprintForecastEngine(ForecastEngine):
     durations: Sequence[float]
     remaining_hours: float
-    rng: Generator = RNGSingleton.rng()
+    rng: Generator = field(default_factory=RNGSingleton.rng)
+    chunk: int = 4_096
 
-    def _sample(self, draws: int) -> np.ndarray:
+    def _sample(self, draws: int, rng: Generator) -> np.ndarray:
         base = np.asarray(self.durations, dtype=float)
         if draws == 1:
             return base[None, :]
-        return self.rng.choice(base, size=(draws, base.size), replace=True)
+        return rng.choice(base, size=(draws, base.size), replace=True)
+
+    def _chunks(self, draws: int, rng: Generator) -> Iterator[np.ndarray]:
+        if draws == 1:
+            yield self._sample(1, rng)
+            return
+        base = np.asarray(self.durations, dtype=float)
+        for start in range(0, draws, self.chunk):
+            n = min(self.chunk, draws - start)
+            yield rng.choice(base, size=(n, base.size), replace=True)
 
     def forecast(self, draws: int = 1_000) -> ForecastResult:
-        if not self.durations:
+        return self.run(draws, self.rng).result()
+
+    def run(self, draws: int, rng: Generator, tally: ForecastTally | None = None) -> ForecastTally:
+        if not len(self.durations):
             raise ValueError("no empirical duration data")
-        dur = self._sample(draws)
-        span = dur.max(axis=1)
-        prob = float((span <= self.remaining_hours).mean())
-        carry = float((dur > self.remaining_hours).sum(axis=1).mean())
-        return ForecastResult(prob, carry)
+        tally = ForecastTally() if tally is None else tally
+        profiling.count("engine.draws", draws)
+        with profiling.span("engine.resample"):
+            for dur in self._chunks(draws, rng):
+                tally.update(dur, dur.max(axis=1), self.remaining_hours)
+        return tally
@@ -12,4 +12,10 @@ class RNGSingleton:
             with cls._lock:
                 if cls._rng is None:
                     cls._rng = default_rng()
-        return cls._rng
\ No newline at end of file
+        return cls._rng
+
+    @classmethod
+    def seed(cls, seed: int | None) -> Generator:
+        with cls._lock:
+            cls._rng = default_rng(seed)
+        return cls._rng
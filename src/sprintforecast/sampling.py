@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+import numpy as np
+from numpy.random import Generator
+
+from .sampling_scheme import SamplingScheme
+
+if TYPE_CHECKING:
+    from scipy.stats import qmc
+
+_EPS = 1e-12
+
+
+@dataclass(slots=True)
+class UniformSampler:
+    scheme: SamplingScheme
+    dims: int
+    rng: Generator
+    _engine: qmc.QMCEngine | None = field(default=None, init=False, repr=False)
+    _pending: np.ndarray | None = field(default=None, init=False, repr=False)
+    _spare: np.ndarray | None = field(default=None, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        # plain MC and antithetic draws never touch scipy, so import it on demand
+        if self.scheme is SamplingScheme.SOBOL:
+            from scipy.stats import qmc
+
+            if self.dims > qmc.Sobol.MAXDIM:
+                raise ValueError(
+                    f"sobol sampling supports at most {qmc.Sobol.MAXDIM} dimensions, "
+                    f"this forecast needs {self.dims}; use halton or lhs"
+                )
+            self._engine = qmc.Sobol(self.dims, scramble=True, seed=self.rng)
+        elif self.scheme is SamplingScheme.HALTON:
+            from scipy.stats import qmc
+
+            self._engine = qmc.Halton(self.dims, scramble=True, seed=self.rng)
+
+    def _antithetic(self, n: int) -> np.ndarray:
+        out = []
+        if self._pending is not None:
+            out.append(self._pending[None, :])
+            self._pending = None
+            n -= 1
+        half = self.rng.random(((n + 1) // 2, self.dims))
+        pairs = np.empty((2 * half.shape[0], self.dims))
+        pairs[0::2] = half
+        pairs[1::2] = 1.0 - half
+        if n % 2:
+            self._pending = pairs[-1]
+            pairs = pairs[:-1]
+        out.append(pairs)
+        return np.concatenate(out)
+
+    def _sobol(self, n: int) -> np.ndarray:
+        assert self._engine is not None
+        spare = self._spare if self._spare is not None else np.empty((0, self.dims))
+        # Sobol points only balance in power-of-two blocks: start with one that covers
+        # the request, then double, and hand out the sequence in order across chunks
+        while len(spare) < n:
+            done = self._engine.num_generated
+            m = done.bit_length() - 1 if done else int(np.ceil(np.log2(n)))
+            spare = np.concatenate([spare, self._engine.random_base2(m)])
+        self._spare = spare[n:]
+        return spare[:n]
+
+    def random(self, n: int) -> np.ndarray:
+        if self.scheme is SamplingScheme.MC:
+            u = self.rng.random((n, self.dims))
+        elif self.scheme is SamplingScheme.LHS:
+            from scipy.stats import qmc
+
+            u = qmc.LatinHypercube(self.dims, seed=self.rng).random(n)
+        elif self.scheme is SamplingScheme.ANTITHETIC:
+            u = self._antithetic(n)
+        elif self.scheme is SamplingScheme.SOBOL:
+            u = self._sobol(n)
+        else:
+            assert self._engine is not None
+            u = self._engine.random(n)
+        # keep inverse CDFs finite at the edges of the unit cube
+        return np.clip(u, _EPS, 1.0 - _EPS)
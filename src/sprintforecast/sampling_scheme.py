@@ -0,0 +1,10 @@
+from enum import Enum
+
+
+# kept free of numpy/scipy so the CLI can offer the choices without loading them
+class SamplingScheme(str, Enum):
+    MC = "mc"
+    SOBOL = "sobol"
+    HALTON = "halton"
+    LHS = "lhs"
+    ANTITHETIC = "antithetic"
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field, replace
+from statistics import NormalDist
+from typing import Any, Iterable, Mapping, Sequence
+
+import numpy as np
+from numpy.random import Generator
+
+from .dependency_simulator import DependencySimulator
+from .forecast import SprintForecastEngine, schedule
+from .pipeline_simulator import PipelineSimulator
+from .queue_simulator import QueueSimulator
+
+
+@dataclass(slots=True, frozen=True)
+class Scenario:
+    name: str
+    drop: tuple[int, ...] = ()
+    workers: int | None = None
+    remaining_hours: float | None = None
+    extra_hours: float = 0.0
+    capacity: float = 1.0
+
+    def __post_init__(self) -> None:
+        if self.capacity <= 0:
+            raise ValueError("capacity must be positive")
+        if self.workers is not None and self.workers <= 0:
+            raise ValueError("workers must be positive")
+
+    @classmethod
+    def from_mapping(cls, data: Mapping[str, Any], index: Mapping[int, int] | None = None) -> Scenario:
+        drop = [int(d) for d in data.get("drop", ())]
+        if index is not None:
+            missing = [d for d in drop if d not in index]
+            if missing:
+                raise ValueError(f"scenario {data.get('name')!r} drops unknown tickets {missing}")
+            drop = [index[d] for d in drop]
+        return cls(
+            name=str(data["name"]),
+            drop=tuple(drop),
+            workers=data.get("workers"),
+            remaining_hours=data.get("remaining_hours", data.get("remaining")),
+            extra_hours=float(data.get("extra_hours", 0.0)),
+            capacity=float(data.get("capacity", 1.0)),
+        )
+
+
+@dataclass(slots=True, frozen=True)
+class PairedDelta:
+    mean: float
+    interval: tuple[float, float]
+
+
+@dataclass(slots=True, frozen=True)
+class ScenarioResult:
+    scenario: Scenario
+    probability: float
+    expected_carry: float
+    probability_delta: PairedDelta
+    carry_delta: PairedDelta
+
+
+@dataclass(slots=True, frozen=True)
+class ScenarioEngine:
+    engine: SprintForecastEngine
+    draws: int = 10_000
+    rng: Generator | None = None
+    confidence: float = 0.95
+    _dev: np.ndarray = field(init=False, repr=False, compare=False)
+    _review: np.ndarray = field(init=False, repr=False, compare=False)
+    _base: tuple[np.ndarray, np.ndarray] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        rng = self.rng if self.rng is not None else self.engine.rng
+        dev, review = self.engine.sample_stages(self.draws, rng)
+        object.__setattr__(self, "_dev", dev)
+        object.__setattr__(self, "_review", review)
+        object.__setattr__(self, "_base", self._outcomes(Scenario("baseline")))
+
+    def _simulator(
+        self, s: Scenario, keep: np.ndarray
+    ) -> QueueSimulator | DependencySimulator | PipelineSimulator:
+        sim = self.engine.simulator
+        if isinstance(sim, DependencySimulator):
+            return sim.subset(keep.tolist(), s.workers)
+        if isinstance(sim, PipelineSimulator):
+            return sim if s.workers is None else replace(sim, developers=s.workers)
+        return sim if s.workers is None else QueueSimulator(s.workers)
+
+    def _outcomes(self, s: Scenario) -> tuple[np.ndarray, np.ndarray]:
+        n = self._dev.shape[1]
+        if any(not 0 <= i < n for i in s.drop):
+            raise ValueError(f"scenario {s.name!r} drops tickets outside 0..{n - 1}")
+        keep = np.setdiff1d(np.arange(n), np.asarray(s.drop, dtype=np.intp))
+        dev = self._dev[:, keep] / s.capacity
+        review = self._review[:, keep] / s.capacity
+        finish, span, _ = schedule(self._simulator(s, keep), dev, review)
+        deadline = (
+            self.engine.remaining_hours if s.remaining_hours is None else s.remaining_hours
+        ) + s.extra_hours
+        return (span <= deadline).astype(float), (finish > deadline).sum(axis=1).astype(float)
+
+    def _paired(self, diff: np.ndarray) -> PairedDelta:
+        mean = float(diff.mean())
+        se = float(diff.std(ddof=1)) / math.sqrt(diff.size) if diff.size > 1 else float("inf")
+        z = NormalDist().inv_cdf(0.5 + self.confidence / 2)
+        return PairedDelta(mean, (mean - z * se, mean + z * se))
+
+    def evaluate(self, scenario: Scenario) -> ScenarioResult:
+        ok, carry = self._outcomes(scenario)
+        base_ok, base_carry = self._base
+        return ScenarioResult(
+            scenario=scenario,
+            probability=float(ok.mean()),
+            expected_carry=float(carry.mean()),
+            probability_delta=self._paired(ok - base_ok),
+            carry_delta=self._paired(carry - base_carry),
+        )
+
+    def evaluate_many(self, scenarios: Iterable[Scenario]) -> list[ScenarioResult]:
+        return [self.evaluate(s) for s in scenarios]
+
+
+def load_scenarios(
+    items: Sequence[Mapping[str, Any]], index: Mapping[int, int] | None = None
+) -> list[Scenario]:
+    return [Scenario.from_mapping(d, index) for d in items]
@@ -0,0 +1,420 @@
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Mapping
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+from numpy.random import default_rng
+
+from .accumulator import ForecastAccumulator
+from .adaptive import wilson_interval
+from .forecast import SprintForecastEngine, fit_lognormal, forecast_engine, schedule
+from .github_client import GitHubClient
+from .intake_optimizer import IntakeOptimizer
+from .label_durations import LABEL_EVENTS, extract_label_durations, label_durations
+from .local_store import LocalStore
+from .size import Size
+from .strategies import ExecutionStrategy, ReviewStrategy
+from .ticket_batch import TicketBatch
+from .triad_fetcher import Triad, TriadFetcher, partition_triads
+
+Key = tuple[str, str, int, bool]
+
+log = logging.getLogger(__name__)
+
+
+# everything a query needs, loaded once per project and swapped whole on refresh
+@dataclass(slots=True, frozen=True)
+class WarmProject:
+    triads: tuple[Triad, ...]
+    batch: TicketBatch
+    engine: SprintForecastEngine
+    dev: np.ndarray
+    review: np.ndarray
+    loaded: float
+    _schedules: dict[tuple, tuple] = field(default_factory=dict, repr=False, compare=False)
+    _answers: dict[tuple, Any] = field(default_factory=dict, repr=False, compare=False)
+    # handler threads share the memo and the schedules
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def engine_for(
+        self, workers: int, respect_deps: bool = False, reviewers: int | None = None
+    ) -> SprintForecastEngine:
+        e = self.engine
+        return forecast_engine(
+            self.triads, e.remaining_hours, workers,
+            respect_deps=respect_deps, reviewers=reviewers,
+            exec_strategy=e.exec_strategy, review_strategy=e.review_strategy, rng=e.rng,
+        )
+
+    def recall(self, key: tuple) -> Any:
+        with self._lock:
+            return self._answers.get(key)
+
+    def remember(self, key: tuple, answer: Any, limit: int = 512) -> Any:
+        # queries vary freely in their float parameters, so keep the memo bounded
+        with self._lock:
+            if len(self._answers) >= limit:
+                self._answers.clear()
+            self._answers[key] = answer
+        return answer
+
+    def schedule(
+        self, workers: int, respect_deps: bool = False, reviewers: int | None = None
+    ) -> tuple:
+        # finish times do not depend on the deadline, so one schedule serves any remaining hours
+        key = (workers, respect_deps, reviewers)
+        with self._lock:
+            hit = self._schedules.get(key)
+        if hit is None:
+            # simulate outside the lock; a racing thread's identical result is dropped
+            sim = self.engine_for(workers, respect_deps, reviewers).simulator
+            hit = schedule(sim, self.dev, self.review)
+            with self._lock:
+                hit = self._schedules.setdefault(key, hit)
+        return hit
+
+
+@dataclass(slots=True)
+class ForecastService:
+    gh: GitHubClient | None = None
+    store: Path | None = None
+    draws: int = 4_000
+    ttl: float = 300.0
+    concurrency: int = 8
+    seed: int | None = None
+    clock: Callable[[], float] = time.monotonic
+    _warm: dict[Key, WarmProject] = field(default_factory=dict, repr=False)
+    # key -> (clock time, message) of the last refresh that failed, until one succeeds
+    _errors: dict[Key, tuple[float, str]] = field(default_factory=dict, repr=False)
+    _locks: dict[Key, threading.Lock] = field(default_factory=dict, repr=False)
+    _guard: threading.Lock = field(default_factory=threading.Lock, repr=False)
+    _stop: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    def __post_init__(self) -> None:
+        if (self.gh is None) == (self.store is None):
+            raise ValueError("give exactly one of a GitHub client or a local store")
+        if self.draws <= 0 or self.ttl <= 0:
+            raise ValueError("draws and ttl must be positive")
+
+    def _fetch(self, owner: str, repo: str, project: int, empirical: bool):
+        if self.store is not None:
+            # sqlite connections are per thread, and loads run on request threads
+            store = LocalStore(self.store)
+            try:
+                triads = store.triads(owner, repo, project)
+                nums = [t.number for t in triads]
+                spent = (
+                    label_durations(store.timelines(owner, repo, nums, LABEL_EVENTS))
+                    if empirical
+                    else None
+                )
+            finally:
+                store.close()
+            return triads, spent
+        triads = TriadFetcher(self.gh, owner, repo, project).fetch()
+        nums = [t.number for t in triads]
+        spent = (
+            extract_label_durations(self.gh, owner, repo, nums, concurrency=self.concurrency)
+            if empirical
+            else None
+        )
+        return triads, spent
+
+    def load(self, owner: str, repo: str, project: int, empirical: bool = False) -> WarmProject:
+        triads, spent = self._fetch(owner, repo, project, empirical)
+        # degenerate estimates are left out, as the CLI does, rather than failing the project
+        triads, _ = partition_triads(triads)
+        if not triads:
+            raise LookupError(f"{owner}/{repo} project {project} has no issues with PERT triads")
+        strategies: dict[str, Any] = {}
+        if spent is not None:
+            dev, rev = spent
+            strategies = {
+                "exec_strategy": ExecutionStrategy(fit_lognormal(dev)),
+                "review_strategy": ReviewStrategy(fit_lognormal(rev)),
+            }
+        rng = default_rng(self.seed)
+        engine = forecast_engine(triads, 0.0, 1, rng=rng, **strategies)
+        dev, review = engine.sample_stages(self.draws, rng)
+        batch = TicketBatch.from_triads(triads)
+        return WarmProject(tuple(triads), batch, engine, dev, review, self.clock())
+
+    def project(self, owner: str, repo: str, project: int, empirical: bool = False) -> WarmProject:
+        key = (owner, repo, project, empirical)
+        warm = self._warm.get(key)
+        if warm is not None:
+            return warm
+        with self._guard:
+            lock = self._locks.setdefault(key, threading.Lock())
+        # one load per project, however many requests arrive while it is cold
+        with lock:
+            warm = self._warm.get(key)
+            if warm is None:
+                warm = self._warm[key] = self.load(owner, repo, project, empirical)
+        return warm
+
+    def refresh(self, force: bool = False) -> int:
+        done = 0
+        for key, warm in list(self._warm.items()):
+            if not force and self.clock() - warm.loaded < self.ttl:
+                continue
+            try:
+                # readers keep the old snapshot until the new one is complete
+                self._warm[key] = self.load(*key)
+            except Exception as exc:
+                self._errors[key] = (self.clock(), f"{type(exc).__name__}: {exc}")
+                log.warning("refresh of %s/%s project %s failed: %s", *key[:3], exc)
+                continue
+            self._errors.pop(key, None)
+            done += 1
+        return done
+
+    def health(self) -> dict[str, Any]:
+        now = self.clock()
+        return {
+            "projects": len(self._warm),
+            "draws": self.draws,
+            "stale": [
+                {
+                    "owner": key[0],
+                    "repo": key[1],
+                    "project": key[2],
+                    "empirical": key[3],
+                    "error": msg,
+                    "failed_ago": now - at,
+                    "age": now - self._warm[key].loaded if key in self._warm else None,
+                }
+                for key, (at, msg) in list(self._errors.items())
+            ],
+        }
+
+    def start_refresher(self, every: float | None = None) -> threading.Thread:
+        def loop() -> None:
+            while not self._stop.wait(every or self.ttl / 4):
+                self.refresh()
+
+        t = threading.Thread(target=loop, name="sprintforecast-refresh", daemon=True)
+        t.start()
+        return t
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def forecast(
+        self,
+        owner: str,
+        repo: str,
+        project: int,
+        remaining: float,
+        workers: int = 3,
+        respect_deps: bool = False,
+        reviewers: int | None = None,
+        empirical: bool = False,
+    ) -> dict[str, Any]:
+        if workers <= 0:
+            raise ValueError("workers must be positive")
+        if respect_deps and reviewers is not None:
+            raise ValueError("reviewers cannot be combined with respect_deps")
+        warm = self.project(owner, repo, project, empirical)
+        key = ("forecast", remaining, workers, respect_deps, reviewers)
+        answer = warm.recall(key)
+        if answer is None:
+            finish, span, wait = warm.schedule(workers, respect_deps, reviewers)
+            acc = ForecastAccumulator()
+            acc.update(finish, span, remaining)
+            if wait is not None:
+                acc.add_review_wait(wait)
+            res = acc.result()
+            span_q = acc.makespan_quantiles()
+            answer = warm.remember(key, {
+                "tickets": len(warm.triads),
+                "draws": res.draws,
+                "probability": res.probability,
+                "interval": wilson_interval(acc.successes, acc.draws),
+                "expected_carry": res.expected_carry,
+                "expected_review_wait": res.expected_review_wait,
+                "makespan": {f"p{round(q * 100)}": v for q, v in span_q.items()},
+                "tickets_on_time": {
+                    t.number: p for t, p in zip(warm.triads, acc.ticket_probabilities().tolist())
+                },
+            })
+        return {**answer, "age": self.clock() - warm.loaded}
+
+    def plan(
+        self,
+        owner: str,
+        repo: str,
+        project: int,
+        team: int,
+        length: int,
+        target: float = 0.85,
+        respect_deps: bool = False,
+    ) -> dict[str, Any]:
+        if team <= 0 or length <= 0:
+            raise ValueError("team and length must be positive")
+        warm = self.project(owner, repo, project)
+        key = ("plan", team, length, target, respect_deps)
+        answer = warm.recall(key)
+        if answer is None:
+            engine = warm.engine_for(team, respect_deps)
+            # the engine's own tickets, so a dependency graph applies to them
+            batch = engine.tickets
+            intake = engine.suggested_intake(
+                team * length * 6, batch, target=target, stages=(warm.dev, warm.review)
+            )
+            answer = warm.remember(key, {
+                "capacity": team * length * 6,
+                "hours": intake.hours,
+                "probability": intake.probability,
+                "totals": {s.name: n for s, n in intake.totals.items() if n},
+                "selected": [
+                    {
+                        "number": warm.triads[i].number,
+                        "title": warm.triads[i].title,
+                        "size": Size(float(batch.size[i])).name,
+                        "hours": float(batch.mean[i]),
+                    }
+                    for i in intake.selected
+                ],
+            })
+        return {**answer, "age": self.clock() - warm.loaded}
+
+    def intake(
+        self,
+        owner: str,
+        repo: str,
+        project: int,
+        issues: list[int],
+        hours: float,
+        workers: int = 3,
+        respect_deps: bool = False,
+    ) -> dict[str, Any]:
+        if workers <= 0:
+            raise ValueError("workers must be positive")
+        warm = self.project(owner, repo, project)
+        index = {t.number: i for i, t in enumerate(warm.triads)}
+        missing = [n for n in issues if n not in index]
+        if missing:
+            raise ValueError(f"unknown issues {missing}")
+        sim = warm.engine_for(workers, respect_deps).simulator
+        # hours is total work capacity, as in /plan; the optimizer wants a per-worker deadline
+        opt = IntakeOptimizer(warm.dev, warm.review, sim, hours / workers)
+        keep = sorted(index[n] for n in issues)
+        return {
+            "issues": sorted(issues),
+            "hours": float((warm.dev + warm.review).mean(axis=0)[keep].sum()),
+            "probability": opt.probability(keep),
+            "age": self.clock() - warm.loaded,
+        }
+
+
+def _flag(q: Mapping[str, str], name: str) -> bool:
+    return q.get(name, "").lower() in ("1", "true", "yes")
+
+
+def _project(q: Mapping[str, str]) -> tuple[str, str, int]:
+    return q["owner"], q["repo"], int(q["project"])
+
+
+def _route(service: ForecastService, method: str, path: str, q: Mapping[str, str]) -> Any:
+    if method == "GET" and path == "/health":
+        return service.health()
+    if method == "GET" and path == "/forecast":
+        reviewers = q.get("reviewers")
+        return service.forecast(
+            *_project(q),
+            remaining=float(q["remaining"]),
+            workers=int(q.get("workers", 3)),
+            respect_deps=_flag(q, "respect_deps"),
+            reviewers=None if reviewers is None else int(reviewers),
+            empirical=_flag(q, "empirical"),
+        )
+    if method == "GET" and path == "/plan":
+        return service.plan(
+            *_project(q),
+            team=int(q["team"]),
+            length=int(q["length"]),
+            target=float(q.get("target", 0.85)),
+            respect_deps=_flag(q, "respect_deps"),
+        )
+    if method == "GET" and path == "/intake":
+        return service.intake(
+            *_project(q),
+            issues=[int(n) for n in q["issues"].split(",") if n.strip()],
+            hours=float(q["hours"]),
+            workers=int(q.get("workers", 3)),
+            respect_deps=_flag(q, "respect_deps"),
+        )
+    if method == "POST" and path == "/refresh":
+        return {"refreshed": service.refresh(force=True)}
+    raise FileNotFoundError(path)
+
+
+# ThreadingHTTPServer spawns a thread per connection; this one caps them with a pool
+class ForecastServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self, address: tuple[str, int], service: ForecastService, threads: int = 8
+    ) -> None:
+        if threads <= 0:
+            raise ValueError("threads must be positive")
+        self.service = service
+        self.pool = ThreadPoolExecutor(threads, thread_name_prefix="sprintforecast-http")
+        super().__init__(address, _Handler)
+
+    def process_request(self, request: Any, client_address: Any) -> None:
+        self.pool.submit(self.process_request_thread, request, client_address)
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.pool.shutdown(wait=False, cancel_futures=True)
+        self.service.stop()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    # idle keep-alive connections must not pin the bounded pool forever
+    timeout = 30
+    server: ForecastServer
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+    def _answer(self, method: str) -> None:
+        url = urlsplit(self.path)
+        q = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        try:
+            status, body = 200, _route(self.server.service, method, url.path, q)
+        except FileNotFoundError:
+            status, body = 404, {"error": f"no such endpoint {method} {url.path}"}
+        except KeyError as exc:
+            status, body = 400, {"error": f"missing parameter {exc.args[0]}"}
+        except LookupError as exc:
+            status, body = 404, {"error": str(exc)}
+        except ValueError as exc:
+            status, body = 400, {"error": str(exc)}
+        except Exception as exc:
+            status, body = 500, {"error": f"{type(exc).__name__}: {exc}"}
+        raw = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def do_GET(self) -> None:
+        self._answer("GET")
+
+    def do_POST(self) -> None:
+        self._answer("POST")
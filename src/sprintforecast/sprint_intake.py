@@ -7,4 +7,6 @@ from typing import Mapping
 @dataclass(slots=True, frozen=True)
 class SprintIntake:
     totals: Mapping[Size, int]
-    hours: float
\ No newline at end of file
+    hours: float
+    selected: tuple[int, ...] = ()
+    probability: float | None = None
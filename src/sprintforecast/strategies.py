@@ -9,17 +9,23 @@ from dataclasses import dataclass
 class ExecutionStrategy:
     distribution: Distribution
 
-    def sample(self, size: int, *, rng: Generator) -> Sample:
+    def sample(self, size: int | tuple[int, ...], *, rng: Generator) -> Sample:
         return self.distribution.sample(size, rng=rng)
 
+    def transform(self, u: np.ndarray) -> Sample:
+        return self.distribution.transform(u)
+
 
 @dataclass(slots=True, frozen=True)
 class ReviewStrategy:
     distribution: Distribution
 
-    def sample(self, size: int, *, rng: Generator) -> Sample:
+    def sample(self, size: int | tuple[int, ...], *, rng: Generator) -> Sample:
         return self.distribution.sample(size, rng=rng)
 
+    def transform(self, u: np.ndarray) -> Sample:
+        return self.distribution.transform(u)
+
 
 @dataclass(slots=True, frozen=True)
 class CapacityStrategy:
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Sequence
+
+import numpy as np
+
+from .distributions import BetaDistribution
+from .size import Size
+from .ticket import Ticket
+
+if TYPE_CHECKING:
+    from .triad_fetcher import Triad
+
+_BOUNDS = np.array([s.value for s in Size])
+
+
+@dataclass(slots=True, frozen=True)
+class TicketBatch:
+    optimistic: np.ndarray
+    mode: np.ndarray
+    pessimistic: np.ndarray
+    alpha: np.ndarray
+    beta: np.ndarray
+    mean: np.ndarray
+    size: np.ndarray
+
+    @classmethod
+    def from_arrays(
+        cls,
+        optimistic: Sequence[float] | np.ndarray,
+        mode: Sequence[float] | np.ndarray,
+        pessimistic: Sequence[float] | np.ndarray,
+    ) -> TicketBatch:
+        o = np.ascontiguousarray(optimistic, dtype=float)
+        m = np.ascontiguousarray(mode, dtype=float)
+        p = np.ascontiguousarray(pessimistic, dtype=float)
+        if not o.shape == m.shape == p.shape or o.ndim != 1:
+            raise ValueError("triad arrays must be one-dimensional and of equal length")
+        if not np.all((o < m) & (m < p)):
+            raise ValueError("optimistic < mode < pessimistic must hold")
+        span = p - o
+        mean = (o + 4 * m + p) / 6
+        return cls(
+            optimistic=o,
+            mode=m,
+            pessimistic=p,
+            alpha=1 + 4 * (m - o) / span,
+            beta=1 + 4 * (p - m) / span,
+            mean=mean,
+            size=_BOUNDS[np.searchsorted(_BOUNDS, mean, side="left")],
+        )
+
+    @classmethod
+    def from_tickets(cls, tickets: Sequence[Ticket]) -> TicketBatch:
+        triads = np.array(
+            [(t.optimistic, t.mode, t.pessimistic) for t in tickets], dtype=float
+        ).reshape(-1, 3)
+        return cls.from_arrays(triads[:, 0], triads[:, 1], triads[:, 2])
+
+    @classmethod
+    def from_triads(cls, triads: Sequence[Triad]) -> TicketBatch:
+        return cls.from_tickets([tr.ticket for tr in triads])
+
+    @classmethod
+    def coerce(cls, tickets: Sequence[Ticket] | TicketBatch) -> TicketBatch:
+        if isinstance(tickets, TicketBatch):
+            return tickets
+        return cls.from_tickets(tickets)
+
+    def __len__(self) -> int:
+        return self.mean.size
+
+    def take(self, idx: Sequence[int] | np.ndarray) -> TicketBatch:
+        i = np.asarray(idx, dtype=np.intp)
+        return TicketBatch(
+            optimistic=self.optimistic[i],
+            mode=self.mode[i],
+            pessimistic=self.pessimistic[i],
+            alpha=self.alpha[i],
+            beta=self.beta[i],
+            mean=self.mean[i],
+            size=self.size[i],
+        )
+
+    def base_distribution(self) -> BetaDistribution:
+        return BetaDistribution(self.alpha, self.beta, self.optimistic, self.pessimistic)
+
+    def sizes(self) -> list[Size]:
+        return [Size(v) for v in self.size.tolist()]
@@ -1,7 +1,11 @@
+from . import profiling
 from .github_client import GitHubClient
 
-from datetime import datetime, time
-from typing import Any, Iterator, Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Iterator, Mapping, Sequence, TypeVar
+
+T = TypeVar("T")
 
 
 class TimelineFetcher:
@@ -29,13 +33,12 @@ class TimelineFetcher:
     ) -> Iterator[Mapping[str, Any]]:
         url: str | None = self._root.format(num)
         while url:
-            r = self._gh.get(url, headers=self._hdr, params=self._params)
-            if r.status_code == 403 and int(r.headers.get("X-RateLimit-Remaining", 1)) == 0:
-                reset = int(r.headers["X-RateLimit-Reset"])
-                time.sleep(max(0, reset - time.time()) + 1)
-                continue
-            r.raise_for_status()
-            for ev in r.json():
+            # rate limits and retries are handled by GitHubClient
+            with profiling.span("fetch.timeline.page"):
+                r = self._gh.get(url, headers=self._hdr, params=self._params)
+                r.raise_for_status()
+                page = r.json()
+            for ev in page:
                 if types and ev.get("event") not in types:
                     continue
                 ts = ev.get("created_at")
@@ -46,4 +49,43 @@ class TimelineFetcher:
                     if until and t > until:
                         continue
                 yield ev
-            url = r.links.get("next", {}).get("url")
\ No newline at end of file
+            url = r.links.get("next", {}).get("url")
+
+    def map_events(
+        self,
+        nums: Sequence[int],
+        fn: Callable[[int, Iterator[Mapping[str, Any]]], T],
+        *,
+        types: Sequence[str] | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        concurrency: int = 8,
+    ) -> list[T]:
+        if concurrency <= 0:
+            raise ValueError("concurrency must be positive")
+
+        def one(num: int) -> T:
+            return fn(num, self.iter_events(num, types=types, since=since, until=until))
+
+        if concurrency == 1 or len(nums) <= 1:
+            return [one(n) for n in nums]
+        with ThreadPoolExecutor(max_workers=min(concurrency, len(nums))) as pool:
+            return list(pool.map(one, nums))
+
+    def fetch_many(
+        self,
+        nums: Sequence[int],
+        *,
+        types: Sequence[str] | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        concurrency: int = 8,
+    ) -> list[list[Mapping[str, Any]]]:
+        return self.map_events(
+            nums,
+            lambda _, events: list(events),
+            types=types,
+            since=since,
+            until=until,
+            concurrency=concurrency,
+        )
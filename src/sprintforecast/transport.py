@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import base64
+import json
+import threading
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+
+def _body(request: requests.PreparedRequest) -> str:
+    body = request.body or b""
+    return body.decode() if isinstance(body, bytes) else body
+
+
+def _key(method: str, url: str, body: str) -> str:
+    # host-agnostic, so a cassette replays against any base_url
+    u = urlsplit(url)
+    return json.dumps([method.upper(), f"{u.path}?{u.query}", body])
+
+
+# sends requests for real and appends every exchange to a JSON-lines cassette
+class RecordingAdapter(HTTPAdapter):
+    def __init__(self, path: str | Path, **kw: Any) -> None:
+        super().__init__(**kw)
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def send(self, request: requests.PreparedRequest, **kw: Any) -> requests.Response:
+        r = super().send(request, **kw)
+        entry = {
+            "method": request.method,
+            "url": request.url,
+            "body": _body(request),
+            "status": r.status_code,
+            "headers": dict(r.headers),
+            "content": base64.b64encode(r.content).decode(),
+        }
+        with self._lock, self.path.open("a") as fh:
+            fh.write(json.dumps(entry) + "\n")
+        return r
+
+
+# serves responses from a cassette; repeated requests replay in recorded order
+class ReplayAdapter(BaseAdapter):
+    def __init__(self, path: str | Path, *, strict: bool = True) -> None:
+        super().__init__()
+        self.strict = strict
+        self._entries: dict[str, deque[dict[str, Any]]] = defaultdict(deque)
+        self._last: dict[str, dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        with Path(path).open() as fh:
+            for line in fh:
+                if line.strip():
+                    e = json.loads(line)
+                    self._entries[_key(e["method"], e["url"], e["body"])].append(e)
+
+    def send(self, request: requests.PreparedRequest, **kw: Any) -> requests.Response:
+        key = _key(request.method or "GET", request.url or "", _body(request))
+        with self._lock:
+            queue = self._entries.get(key)
+            if queue:
+                e = queue.popleft()
+                self._last[key] = e
+            elif not self.strict and key in self._last:
+                e = self._last[key]
+            else:
+                raise RuntimeError(f"no recorded response for {request.method} {request.url}")
+        r = requests.Response()
+        r.status_code = e["status"]
+        r.headers = CaseInsensitiveDict(e["headers"])
+        r._content = base64.b64decode(e["content"])
+        r.url = request.url
+        r.request = request
+        r.encoding = "utf-8"
+        return r
+
+    def close(self) -> None:
+        pass
@@ -2,6 +2,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Any
 
+from . import profiling
 from .github_client import GitHubClient
 
 from .ticket import Ticket
@@ -15,6 +16,16 @@ class Triad:
     deps: tuple[int, ...]
 
 
+def partition_triads(triads: list[Triad]) -> tuple[list[Triad], list[Triad]]:
+    # board fields are free-form numbers, so o < m < p is not guaranteed
+    good: list[Triad] = []
+    bad: list[Triad] = []
+    for tr in triads:
+        t = tr.ticket
+        (good if t.optimistic < t.mode < t.pessimistic else bad).append(tr)
+    return good, bad
+
+
 @dataclass(slots=True, frozen=True)
 class TriadFetcher:
     client: GitHubClient
@@ -22,15 +33,18 @@ class TriadFetcher:
     repo: str
     project: int
     page: int = 50
+    dep_page: int = 25
 
     _Q = """
-    query($owner:String!,$repo:String!,$first:Int!,$after:String){
+    query($owner:String!,$repo:String!,$first:Int!,$after:String,$deps:Int!,$order:IssueOrder){
+      rateLimit{limit,cost,remaining,resetAt}
       repository(owner:$owner,name:$repo){
-        issues(states:OPEN,first:$first,after:$after){
+        issues(states:OPEN,first:$first,after:$after,orderBy:$order){
           pageInfo{endCursor,hasNextPage}
           nodes{
             number
             title
+            updatedAt
             projectItems(first:10){
               nodes{
                 project{number}
@@ -44,13 +58,18 @@ class TriadFetcher:
                 }
               }
             }
+            timelineItems(first:$deps,itemTypes:[CONNECTED_EVENT]){%s}
           }
         }
       }
     }
-    """
+    """ % DependencyFetcher.EVENTS
 
-    def _run(self, after: str | None) -> dict[str, Any]:
+    def _run(self, after: str | None, order: dict[str, str] | None = None) -> dict[str, Any]:
+        with profiling.span("fetch.triads.page"):
+            return self._page(after, order)
+
+    def _page(self, after: str | None, order: dict[str, str] | None) -> dict[str, Any]:
         r = self.client.post(
             "graphql",
             json={
@@ -60,8 +79,11 @@ class TriadFetcher:
                     "repo": self.repo,
                     "first": self.page,
                     "after": after,
+                    "deps": self.dep_page,
+                    "order": order,
                 },
             },
+            headers=DependencyFetcher.HEADERS,
         )
         r.raise_for_status()
         payload: dict[str, Any] = r.json()
@@ -77,6 +99,31 @@ class TriadFetcher:
                 return float(n["number"])
         return None
 
+    def _triad(self, n: dict[str, Any], dep_f: DependencyFetcher) -> Triad | None:
+        triad: tuple[float, float, float] | None = None
+        for it in n["projectItems"]["nodes"]:
+            if it["project"]["number"] != self.project:
+                continue
+            o = self._num(it, "o")
+            m = self._num(it, "m")
+            p = self._num(it, "p")
+            if None not in (o, m, p):
+                triad = (o, m, p)
+                break
+        if not triad:
+            return None
+        items = n["timelineItems"]
+        deps = DependencyFetcher.parse(n["number"], items)
+        if items["pageInfo"]["hasNextPage"]:
+            profiling.count("fetch.dependency_followups")
+            deps |= dep_f.fetch(n["number"], items["pageInfo"]["endCursor"])
+        return Triad(
+            number=n["number"],
+            title=n["title"],
+            ticket=Ticket(*triad),
+            deps=tuple(sorted(deps)),
+        )
+
     def fetch(self) -> list[Triad]:
         out: list[Triad] = []
         dep_f = DependencyFetcher(self.client, self.owner, self.repo)
@@ -84,27 +131,34 @@ class TriadFetcher:
         while True:
             page = self._run(after)
             for n in page["nodes"]:
-                triad: tuple[float, float, float] | None = None
-                for it in n["projectItems"]["nodes"]:
-                    if it["project"]["number"] != self.project:
-                        continue
-                    o = self._num(it, "o")
-                    m = self._num(it, "m")
-                    p = self._num(it, "p")
-                    if None not in (o, m, p):
-                        triad = (o, m, p)
-                        break
+                triad = self._triad(n, dep_f)
                 if triad:
-                    deps = dep_f.fetch(n["number"])
-                    out.append(
-                        Triad(
-                            number=n["number"],
-                            title=n["title"],
-                            ticket=Ticket(*triad),
-                            deps=tuple(deps),
-                        )
-                    )
+                    out.append(triad)
             if not page["pageInfo"]["hasNextPage"]:
                 break
             after = page["pageInfo"]["endCursor"]
         return out
+
+    def updated(self, since: str | None = None) -> tuple[list[Triad], list[int], str | None]:
+        # newest first, so paging stops at the first issue older than the cursor;
+        # returns the triads, every issue number scanned and the new high-water mark
+        out: list[Triad] = []
+        seen: list[int] = []
+        mark = since
+        dep_f = DependencyFetcher(self.client, self.owner, self.repo)
+        after: str | None = None
+        while True:
+            page = self._run(after, {"field": "UPDATED_AT", "direction": "DESC"})
+            for n in page["nodes"]:
+                stamp = n.get("updatedAt")
+                if since is not None and stamp is not None and stamp < since:
+                    return out, seen, mark
+                if stamp is not None and (mark is None or stamp > mark):
+                    mark = stamp
+                seen.append(n["number"])
+                triad = self._triad(n, dep_f)
+                if triad:
+                    out.append(triad)
+            if not page["pageInfo"]["hasNextPage"]:
+                return out, seen, mark
+            after = page["pageInfo"]["endCursor"]
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Iterator, Mapping, Sequence
+
+from .event_table import EventTable
+from .github_client import GitHubClient
+from .timeline_fetcher import TimelineFetcher
+
+_SOURCES = ("label", "column", "status")
+
+LABEL_EVENTS = ("labeled", "unlabeled")
+COLUMN_EVENTS = ("moved_columns_in_project", "added_to_project")
+STATUS_EVENTS = ("project_v2_item_status_changed",)
+ALL_EVENTS = LABEL_EVENTS + COLUMN_EVENTS + STATUS_EVENTS
+
+
+def _key(name: str | None) -> str:
+    return (name or "").strip().lower()
+
+
+@dataclass(slots=True, frozen=True)
+class WorkflowSpec:
+    states: tuple[str, ...]
+    labels: Mapping[str, int] = field(default_factory=dict)
+    columns: Mapping[str, int] = field(default_factory=dict)
+    status: Mapping[str, int] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        if not self.states or len(set(self.states)) != len(self.states):
+            raise ValueError("workflow states must be non-empty and unique")
+        for m in (self.labels, self.columns, self.status):
+            if any(not 0 <= k < len(self.states) for k in m.values()):
+                raise ValueError("workflow trigger refers to an unknown state")
+
+    @classmethod
+    def from_mapping(cls, data: Mapping[str, Mapping[str, Any]]) -> WorkflowSpec:
+        # {"dev": {"label": "dev", "column": ["Dev", "In progress"]}, "qa": {"status": "QA"}}
+        if not isinstance(data, Mapping):
+            raise ValueError("workflow must map state names to their triggers")
+        states = tuple(data)
+        found: dict[str, dict[str, int]] = {s: {} for s in _SOURCES}
+        for k, name in enumerate(states):
+            if not isinstance(data[name], Mapping):
+                raise ValueError(f"state {name!r}: expected a mapping of triggers")
+            for src, values in data[name].items():
+                if src not in found:
+                    raise ValueError(f"state {name!r}: unknown trigger {src!r}")
+                values = [values] if isinstance(values, str) else values
+                if not isinstance(values, (list, tuple)) or not all(
+                    isinstance(v, str) for v in values
+                ):
+                    raise ValueError(f"state {name!r}: {src} must be a name or a list of names")
+                for v in values:
+                    found[src][_key(v)] = k
+        return cls(states, found["label"], found["column"], found["status"])
+
+    @classmethod
+    def parse(cls, items: Sequence[str]) -> WorkflowSpec:
+        # "qa=label:qa,status:In QA" per state, as given on the command line
+        data: dict[str, dict[str, list[str]]] = {}
+        for item in items:
+            name, sep, rest = item.partition("=")
+            if not sep or not name.strip():
+                raise ValueError(f"expected state=source:value[,...], got {item!r}")
+            triggers = data.setdefault(name.strip(), {})
+            for part in rest.split(","):
+                src, sep, value = part.partition(":")
+                if not sep:
+                    raise ValueError(f"expected source:value in {item!r}")
+                triggers.setdefault(src.strip(), []).append(value)
+        return cls.from_mapping(data)
+
+    @classmethod
+    def default(cls) -> WorkflowSpec:
+        return cls.from_mapping(
+            {"dev": {"label": "dev", "column": "Dev"}, "review": {"label": "review", "column": "Review"}}
+        )
+
+    @classmethod
+    def from_labels(cls, *names: str) -> WorkflowSpec:
+        return cls.from_mapping({n: {"label": n} for n in names or ("dev", "review")})
+
+    @classmethod
+    def from_columns(cls, *names: str) -> WorkflowSpec:
+        return cls.from_mapping({n.lower(): {"column": n} for n in names or ("Dev", "Review")})
+
+    def event_types(self) -> tuple[str, ...]:
+        return (
+            (LABEL_EVENTS if self.labels else ())
+            + (COLUMN_EVENTS if self.columns else ())
+            + (STATUS_EVENTS if self.status else ())
+        )
+
+    def rows(self, num: int, events: Iterable[Mapping[str, Any]]) -> Iterator[tuple[int, int, bool, str]]:
+        for ev in events:
+            ts = ev.get("created_at")
+            kind = ev.get("event")
+            if not ts:
+                continue
+            if kind in LABEL_EVENTS:
+                k = self.labels.get(_key((ev.get("label") or {}).get("name")))
+                if k is not None:
+                    yield num, k, kind == "labeled", ts
+                continue
+            if kind in COLUMN_EVENTS:
+                card = ev.get("project_card") or {}
+                before, after, triggers = card.get("previous_column_name"), card.get("column_name"), self.columns
+            elif kind in STATUS_EVENTS:
+                before, after, triggers = ev.get("previous_status"), ev.get("status"), self.status
+            else:
+                continue
+            # a move is an exit from the old state and an entry into the new one
+            k = triggers.get(_key(before))
+            if k is not None:
+                yield num, k, False, ts
+            k = triggers.get(_key(after))
+            if k is not None:
+                yield num, k, True, ts
+
+    def table(self, num: int, events: Iterable[Mapping[str, Any]]) -> EventTable:
+        return EventTable.from_rows(self.rows(num, events), self.states)
+
+    def table_from_timelines(
+        self, timelines: Sequence[Iterable[Mapping[str, Any]]], nums: Sequence[int] | None = None
+    ) -> EventTable:
+        nums = range(len(timelines)) if nums is None else nums
+        rows = (r for n, events in zip(nums, timelines) for r in self.rows(n, events))
+        return EventTable.from_rows(rows, self.states)
+
+
+def fetch_event_table(
+    gh: GitHubClient,
+    owner: str,
+    repo: str,
+    nums: Sequence[int],
+    spec: WorkflowSpec,
+    concurrency: int = 8,
+) -> EventTable:
+    # each issue is reduced to compact rows as its pages stream in
+    tf = TimelineFetcher(gh, owner, repo)
+    tables = tf.map_events(nums, spec.table, types=spec.event_types(), concurrency=concurrency)
+    return EventTable.concat(tables) if tables else EventTable.empty(spec.states)
+